@@ -1,16 +1,35 @@
 from __future__ import annotations
 
+import functools
+import hashlib
+import logging
+from datetime import date, time
 from pathlib import Path
+from typing import IO
 
-import yaml
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator, model_validator
 
-WEEKDAY_NAMES = {
+logger = logging.getLogger(__name__)
+
+WEEKDAY_NAMES = frozenset({
     "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"
+})
+WEEKDAY_INDEX = {
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
+    "Friday": 4, "Saturday": 5, "Sunday": 6,
 }
 
+# Validated configs keyed by the blake2b digest of the raw file bytes; the one
+# place a validated AppConfig is kept (load_config's stat cache only saves
+# re-reading and re-hashing an unchanged file)
+_TRUSTED_CACHE: dict[bytes, AppConfig] = {}
+
 
 class Target(BaseModel):
+    # Targets are shared across scheduler threads; freezing them keeps the
+    # values derived at validation time below from going stale
+    model_config = ConfigDict(frozen=True)
+
     venue_id: int
     venue_name: str
     start_date: str                       # "YYYY-MM-DD"
@@ -22,37 +41,161 @@ class Target(BaseModel):
     venue_timezone: str = "America/New_York"
     poll_interval_seconds: int = 60
 
+    # Sorted dates in [start_date, end_date] falling on days_of_week; computed
+    # once at validation time so scheduler jobs never regenerate it
+    _candidate_dates: list[date] = PrivateAttr(default_factory=list)
+    _time_center_minutes: int = PrivateAttr(default=0)
+    _weekday_mask: int = PrivateAttr(default=0)
+
     @field_validator("start_date", "end_date")
     @classmethod
     def validate_date(cls, v: str) -> str:
-        from datetime import date
         date.fromisoformat(v)
         return v
 
     @field_validator("time_center")
     @classmethod
     def validate_time_center(cls, v: str) -> str:
-        from datetime import time
         time.fromisoformat(v)
         return v
 
     @field_validator("days_of_week")
     @classmethod
     def validate_days_of_week(cls, v: list[str]) -> list[str]:
-        for day in v:
-            if day not in WEEKDAY_NAMES:
-                raise ValueError(
-                    f"Invalid day of week: {day!r}. "
-                    f"Must be one of {sorted(WEEKDAY_NAMES)}"
-                )
+        bad = set(v) - WEEKDAY_NAMES
+        if bad:
+            raise ValueError(
+                f"Invalid day(s) of week: {sorted(bad)}. "
+                f"Must be one of {sorted(WEEKDAY_NAMES)}"
+            )
         return v
 
+    @model_validator(mode="after")
+    def compute_candidate_dates(self) -> Target:
+        mask = 0
+        for day in self.days_of_week:
+            mask |= 1 << WEEKDAY_INDEX[day]
+        self._weekday_mask = mask
+        self._candidate_dates = _candidate_dates(
+            date.fromisoformat(self.start_date),
+            date.fromisoformat(self.end_date),
+            mask,
+        )
+        center = time.fromisoformat(self.time_center)
+        self._time_center_minutes = center.hour * 60 + center.minute
+        return self
+
+    @property
+    def candidate_dates(self) -> list[date]:
+        return self._candidate_dates
+
+    @property
+    def time_center_minutes(self) -> int:
+        """time_center as minutes past midnight."""
+        return self._time_center_minutes
+
+    @property
+    def weekday_mask(self) -> int:
+        """days_of_week as a 7-bit mask; bit 0 is Monday, bit 6 is Sunday."""
+        return self._weekday_mask
+
+
+def _candidate_dates(start: date, end: date, weekday_mask: int) -> list[date]:
+    """Return the sorted dates in [start, end] whose weekday bit is set in weekday_mask.
+
+    Steps a week at a time from the first occurrence of each weekday rather
+    than walking every day in the range.
+    """
+    start_ord, end_ord = start.toordinal(), end.toordinal()
+    ordinals = sorted(
+        ordinal
+        for weekday in range(7)
+        if (weekday_mask >> weekday) & 1
+        for ordinal in range(start_ord + (weekday - start.weekday()) % 7, end_ord + 1, 7)
+    )
+    return [date.fromordinal(ordinal) for ordinal in ordinals]
+
 
 class AppConfig(BaseModel):
+    # load_config / load_config_trusted hand the same cached instance to
+    # every caller
+    model_config = ConfigDict(frozen=True)
+
     targets: list[Target]
 
 
+@functools.cache
+def _yaml_loader() -> type:
+    """Return the libyaml-backed loader when PyYAML was built with it, warning
+    otherwise so a deployment without libyaml doesn't regress silently.
+
+    PyYAML is imported on first use rather than at module load, so code that
+    only needs the models doesn't pay for it.
+    """
+    import yaml
+    if getattr(yaml, "__with_libyaml__", False):
+        return yaml.CSafeLoader
+    logger.warning(
+        "PyYAML was built without libyaml; falling back to the slower pure-Python loader"
+    )
+    return yaml.SafeLoader
+
+
+def _load_yaml_sections(stream: IO[str] | bytes) -> object:
+    """Parse YAML, building Python objects only for AppConfig's top-level keys.
+
+    The document is composed into a node graph first; sections that
+    AppConfig would ignore anyway are never constructed.
+    """
+    import yaml
+
+    loader = _yaml_loader()(stream)
+    try:
+        root = loader.get_single_node()
+        if not isinstance(root, yaml.MappingNode):
+            return loader.construct_document(root) if root is not None else None
+        data = {}
+        for key_node, value_node in root.value:
+            key = loader.construct_object(key_node)
+            if key in AppConfig.model_fields:
+                data[key] = loader.construct_object(value_node, deep=True)
+        return data
+    finally:
+        loader.dispose()
+
+
 def load_config(path: str | Path = "config.yaml") -> AppConfig:
-    with open(path) as f:
-        data = yaml.safe_load(f)
-    return AppConfig.model_validate(data)
+    """Load and validate config, reusing the result while the file is unchanged.
+
+    Unchanged files (same resolved path, mtime and size) are answered without
+    reading them.  Otherwise the file goes through ``load_config_trusted``, so
+    content that was already validated (e.g. a touched but unedited file) is
+    not validated again.  Repeated calls for the same content return the same
+    (frozen) ``AppConfig`` instance.
+    """
+    path = Path(path).resolve()
+    st = path.stat()
+    return _load_config_cached(path, st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _load_config_cached(path: Path, mtime_ns: int, size: int) -> AppConfig:
+    return load_config_trusted(path)
+
+
+def load_config_trusted(path: str | Path = "config.yaml") -> AppConfig:
+    """Load config, skipping validation when the file content was seen before.
+
+    The first load of a given file content is fully validated; subsequent
+    loads of byte-identical content (hot reloads, restarts in the same
+    process) return the cached ``AppConfig`` without re-running validators.
+    """
+    raw = Path(path).read_bytes()
+    digest = hashlib.blake2b(raw).digest()
+    cached = _TRUSTED_CACHE.get(digest)
+    if cached is not None:
+        return cached
+    config = AppConfig.model_validate(_load_yaml_sections(raw))
+    _TRUSTED_CACHE[digest] = config
+    return config
+
@@ -1,12 +1,34 @@
 from __future__ import annotations
 
+import functools
+import json
 import logging
+import operator
+import os
 import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
-from typing import Optional
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
 
-import requests
+if TYPE_CHECKING:
+    import requests
+
+try:
+    # Parses straight from response bytes; ~2-3x faster than stdlib json
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # C parser for ISO 8601 timestamps; roughly twice as fast as fromisoformat
+    from ciso8601 import parse_datetime as _parse_dt
+except ImportError:
+    _parse_dt = datetime.fromisoformat
 
 logger = logging.getLogger(__name__)
 
@@ -15,16 +37,142 @@ BASE_URL = "https://api.resy.com"
 # Days-out windows probed when doing empirical booking-window discovery (largest first)
 _EMPIRICAL_PROBE_WINDOWS = [60, 45, 30, 28, 21, 14, 7]
 
+# Discovered venue schedules older than this are re-probed
+SCHEDULE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+# Upper bound on concurrent /4/find requests issued by find_slots_batch
+_MAX_FIND_WORKERS = 8
+
+# need_to_know text patterns, compiled once at import.  Alternatives are fused
+# into a single regex each so the text is scanned in one pass, and all are
+# case-insensitive so callers never need to lowercase a copy of the text.
+# Each alternative has its own named group: when a text matches several, the
+# parsers pick by phrasing priority (_WINDOW_PRIORITY, then midnight > noon >
+# clock time), not by which phrase comes first in the text.
+_WINDOW_RE = re.compile(
+    r"(?P<advance>\d+)\s*days?\s+in\s+advance"
+    r"|(?P<ahead>\d+)\s*days?\s+ahead"
+    r"|(?P<before>\d+)\s*days?\s+before"
+    r"|up\s+to\s+(?P<up_to>\d+)\s*days?"
+    r"|books?\s+(?P<books>\d+)\s*days?",
+    re.IGNORECASE,
+)
+_WINDOW_PRIORITY = ("advance", "ahead", "before", "up_to", "books")
+_RELEASE_RE = re.compile(
+    r"(?:opens?|releases?|available|drops?)\s+at\s+"
+    r"(?:(?P<midnight>midnight)|(?P<noon>noon)"
+    r"|(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm))",
+    re.IGNORECASE,
+)
+# Release times as stored in the schedule cache and consumed by the scheduler
+_HHMM_RE = re.compile(r"(?:[01]\d|2[0-3]):[0-5]\d")
+# Byte-level markers for an empty vs non-empty "venues" array in /4/find bodies
+_EMPTY_VENUES_RE = re.compile(rb'"venues"\s*:\s*\[\s*\]')
+_NONEMPTY_VENUES_RE = re.compile(rb'"venues"\s*:\s*\[\s*\{')
+
+# Substrings at least one of which must appear for any release-time regex to
+# match (lower, title and upper case, since the regexes ignore case)
+_RELEASE_HINTS = tuple(
+    variant
+    for word in ("am", "pm", "midnight", "noon")
+    for variant in (word, word.title(), word.upper())
+)
+_AT_TIME_RE = re.compile(
+    r"\bat\s+(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)", re.IGNORECASE
+)
+
+
+def _decode(resp: requests.Response) -> dict:
+    """Decode a JSON response body, via orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
+
+@functools.lru_cache(maxsize=4)
+def _payment_method_struct(payment_method_id: int) -> str:
+    """Return /3/book's JSON-encoded struct_payment_method for a card id."""
+    return f'{{"id":{payment_method_id}}}'
+
+
+def _parse_slot_start(date_str: str) -> datetime | None:
+    """Parse a slot's ``date.start`` timestamp, or log and return None."""
+    try:
+        return _parse_dt(date_str)
+    except ValueError:
+        logger.warning("Could not parse slot date: %s", date_str)
+        return None
+
+
+def _disk_key(key: tuple[int, int]) -> str:
+    """JSON object key for a (venue_id, party_size) schedule cache entry."""
+    return "%d:%d" % key
+
+
+def _need_to_know_body(template: dict) -> str | None:
+    """Return a template's need_to_know body, or None if any level is missing."""
+    try:
+        return template["content"]["en-us"]["need_to_know"]["body"]
+    except (KeyError, TypeError):
+        return None
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Slot:
     config_id: str
     start_time: datetime
-    token: Optional[str] = None    # populated after get_booking_token()
+    token: Optional[str] = None    # booking token; Slot is frozen, so attach one with dataclasses.replace()
+
+
+# C-level lookups for the /4/find slot fields walked once per slot
+_get_config = operator.itemgetter("config")
+_get_token = operator.itemgetter("token")
+_get_date = operator.itemgetter("date")
+_get_start = operator.itemgetter("start")
+
+
+def _slot_from(slot_data: dict) -> Slot | None:
+    """Build a Slot from one /4/find slot entry, or None if it's unusable."""
+    try:
+        config_id = _get_token(_get_config(slot_data))
+    except (KeyError, TypeError):
+        return None
+    if not config_id:
+        return None
+    try:
+        start = _get_start(_get_date(slot_data))
+    except (KeyError, TypeError):
+        logger.warning("Skipping slot %s with no start time", config_id)
+        return None
+    start_time = _parse_slot_start(start)
+    if start_time is None:
+        return None
+    return Slot(config_id=config_id, start_time=start_time)
 
 
 class ResyClient:
-    def __init__(self, api_key: str, auth_token: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        auth_token: str,
+        schedule_cache_path: str | Path | None = None,
+    ) -> None:
+        # (venue_id, party_size) -> (booking_window_days, release_time_local);
+        # optionally persisted to schedule_cache_path so restarts skip discovery.
+        # Party size is part of the key because the /4/find probes depend on it.
+        self._schedule_cache: dict[tuple[int, int], tuple[int, str | None]] = {}
+        self._schedule_cache_path = (
+            Path(schedule_cache_path).expanduser() if schedule_cache_path else None
+        )
+        self._disk_schedules: dict[str, dict] | None = None
+        # The scheduler discovers several targets concurrently; this guards the
+        # lazy load of _disk_schedules, updates to it and rewrites of the file
+        self._disk_schedules_lock = threading.Lock()
+        # Imported here so the module's parsing helpers load without requests
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -39,6 +187,41 @@ class ResyClient:
                 "Referer": "https://resy.com/",
             }
         )
+        # Every call goes to api.resy.com, so one keep-alive pool sized for the
+        # concurrent find_slots fan-out plus overlapping snipe attempts.
+        # Transient gateway errors are retried for GETs only: replaying a
+        # POST to /3/book could make a second reservation.
+        retry = Retry(
+            total=2,
+            backoff_factor=0.1,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        )
+        self.session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+        )
+
+    def close(self) -> None:
+        """Close pooled connections.  The client must not be used afterwards."""
+        self.session.close()
+
+    def __enter__(self) -> ResyClient:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def warm_up(self, venue_id: int) -> None:
+        """Open a pooled connection to the API ahead of a time-critical call.
+
+        Issues a cheap authenticated ``GET /3/venue`` so DNS, TCP and TLS are
+        already done when the next request goes out; the response is discarded.
+        """
+        resp = self.session.get(
+            f"{BASE_URL}/3/venue", params={"venue_id": venue_id}, timeout=10
+        )
+        resp.raise_for_status()
 
     def is_date_on_calendar(self, venue_id: int, date: str, party_size: int) -> bool:
         """Return True if the venue appears in /4/find results for date.
@@ -47,6 +230,9 @@ class ResyClient:
         all slots are already taken.  This is the right signal for release-time
         discovery — a new date appearing on the calendar (fully booked or not)
         marks the moment reservations were released.
+
+        The common "not yet on the calendar" body is recognised from the raw
+        bytes, without decoding the JSON.
         """
         params = {
             "lat": 0,
@@ -57,9 +243,11 @@ class ResyClient:
         }
         resp = self.session.get(f"{BASE_URL}/4/find", params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
-        venues = data.get("results", {}).get("venues", [])
-        return len(venues) > 0
+        body = resp.content
+        if _EMPTY_VENUES_RE.search(body) and not _NONEMPTY_VENUES_RE.search(body):
+            return False
+        data = _decode(resp)
+        return bool(data.get("results", {}).get("venues"))
 
     def find_slots(self, venue_id: int, date: str, party_size: int) -> list[Slot]:
         """GET /4/find — returns available slots for the venue/date/party_size."""
@@ -72,27 +260,39 @@ class ResyClient:
         }
         resp = self.session.get(f"{BASE_URL}/4/find", params=params, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = _decode(resp)
 
-        slots: list[Slot] = []
         venues = data.get("results", {}).get("venues", [])
-        for venue in venues:
-            for slot_data in venue.get("slots", []):
-                config = slot_data.get("config", {})
-                config_id = config.get("token")
-                if not config_id:
-                    continue
-                date_str = slot_data.get("date", {}).get("start", "")
-                try:
-                    start_time = datetime.fromisoformat(date_str)
-                except ValueError:
-                    logger.warning("Could not parse slot date: %s", date_str)
-                    continue
-                slots.append(Slot(config_id=config_id, start_time=start_time))
+        slots = [
+            slot
+            for venue in venues
+            for slot_data in venue.get("slots", ())
+            if (slot := _slot_from(slot_data)) is not None
+        ]
 
         logger.debug("find_slots returned %d slots for venue %s", len(slots), venue_id)
         return slots
 
+    def find_slots_batch(
+        self, queries: list[tuple[int, str, int]]
+    ) -> list[list[Slot] | None]:
+        """Run find_slots concurrently for (venue_id, date, party_size) queries.
+
+        Results come back in query order.  A query whose request failed yields
+        ``None`` instead of raising, so one bad date doesn't sink the batch.
+        """
+        def run(query: tuple[int, str, int]) -> list[Slot] | None:
+            try:
+                return self.find_slots(*query)
+            except Exception as exc:
+                logger.debug("find_slots%s failed: %s", query, exc)
+                return None
+
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(_MAX_FIND_WORKERS, len(queries))) as pool:
+            return list(pool.map(run, queries))
+
     def get_booking_token(self, config_id: str, date: str, party_size: int) -> str:
         """POST /3/details — exchange a slot config_id for a short-lived booking token."""
         payload = {
@@ -102,7 +302,7 @@ class ResyClient:
         }
         resp = self.session.post(f"{BASE_URL}/3/details", json=payload, timeout=10)
         resp.raise_for_status()
-        data = resp.json()
+        data = _decode(resp)
         book_token = data.get("book_token", {}).get("value")
         if not book_token:
             raise ValueError(f"No book_token in /3/details response: {data}")
@@ -112,17 +312,17 @@ class ResyClient:
         """POST /3/book — complete the reservation."""
         payload = {
             "book_token": book_token,
-            "struct_payment_method": f'{{"id":{payment_method_id}}}',
+            "struct_payment_method": _payment_method_struct(payment_method_id),
             "source_id": "resy.com-venue-details",
         }
         resp = self.session.post(
             f"{BASE_URL}/3/book",
+            # requests form-encodes a dict body and sets the Content-Type itself
             data=payload,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
             timeout=10,
         )
         resp.raise_for_status()
-        return resp.json()
+        return _decode(resp)
 
     def discover_venue_schedule(
         self, venue_id: int, party_size: int
@@ -137,8 +337,22 @@ class ResyClient:
           1. Resy venue API  (``GET /3/venue``)
           2. /4/find ``need_to_know`` template text parsing
           3. Empirical ``/4/find`` probing at increasing look-ahead windows
+
+        Results are cached per (venue, party size) in memory and, when the
+        client was given a ``schedule_cache_path``, on disk for
+        ``SCHEDULE_CACHE_TTL_SECONDS``.  The 30-day fallback used when no step
+        succeeds is never written to disk, so a transient outage doesn't pin
+        it across restarts.
         """
-        result = self._discover_venue_schedule_inner(venue_id, party_size)
+        key = (venue_id, party_size)
+        result = self._schedule_cache.get(key) or self._read_disk_schedule(key)
+        if result is None:
+            result = self._discover_venue_schedule_inner(venue_id, party_size)
+            if result is None:
+                result = (30, None)
+            else:
+                self._write_disk_schedule(key, result)
+        self._schedule_cache[key] = result
         window_days, release_time = result
         print(
             f"[venue {venue_id}] Booking window: {window_days} days | "
@@ -148,7 +362,8 @@ class ResyClient:
 
     def _discover_venue_schedule_inner(
         self, venue_id: int, party_size: int
-    ) -> tuple[int, str | None]:
+    ) -> tuple[int, str | None] | None:
+        """Run the discovery steps; ``None`` means none of them found anything."""
         # ------------------------------------------------------------------ #
         # Step 1 — venue API                                                   #
         # ------------------------------------------------------------------ #
@@ -158,7 +373,7 @@ class ResyClient:
                 f"{BASE_URL}/3/venue", params={"venue_id": venue_id}, timeout=10
             )
             resp.raise_for_status()
-            venue_data = resp.json()
+            venue_data = _decode(resp)
 
             window = (
                 venue_data.get("booking_window_days")
@@ -182,7 +397,10 @@ class ResyClient:
         # ------------------------------------------------------------------ #
         # Step 2 — parse need_to_know template text from /4/find             #
         # ------------------------------------------------------------------ #
-        find_venue = self._probe_find_venue(venue_id, party_size)
+        # Probe days that came back with no venue can't have slots either, so
+        # step 3 doesn't ask about them again
+        empty_days: set[int] = set()
+        find_venue = self._probe_find_venue(venue_id, party_size, empty_days)
         if find_venue is not None:
             text = self._extract_need_to_know_text(find_venue)
             if text:
@@ -201,35 +419,122 @@ class ResyClient:
         # Step 3 — empirical /4/find probing                                  #
         # ------------------------------------------------------------------ #
         today = date.today()
-        for days_out in _EMPIRICAL_PROBE_WINDOWS:
-            probe_date = today + timedelta(days=days_out)
-            try:
-                slots = self.find_slots(venue_id, probe_date.isoformat(), party_size)
-                if slots:
-                    logger.info(
-                        "Empirical discovery: slots found at %d days out for venue %s",
-                        days_out,
-                        venue_id,
-                    )
-                    return days_out, None
-            except Exception as exc:
-                logger.debug("Empirical probe at %d days failed: %s", days_out, exc)
+        windows = [d for d in _EMPIRICAL_PROBE_WINDOWS if d not in empty_days]
+        results = self.find_slots_batch(
+            [
+                (venue_id, (today + timedelta(days=days_out)).isoformat(), party_size)
+                for days_out in windows
+            ]
+        )
+        for days_out, slots in zip(windows, results):
+            if slots:
+                logger.info(
+                    "Empirical discovery: slots found at %d days out for venue %s",
+                    days_out,
+                    venue_id,
+                )
+                return days_out, None
 
         logger.warning(
             "Could not determine booking window for venue %s; defaulting to 30 days",
             venue_id,
         )
-        return 30, None
+        return None
 
     # ---------------------------------------------------------------------- #
     # Internal helpers                                                         #
     # ---------------------------------------------------------------------- #
 
-    def _probe_find_venue(self, venue_id: int, party_size: int) -> dict | None:
+    def _load_disk_schedules(self) -> dict[str, dict]:
+        """Return the on-disk schedule cache, reading the file at most once.
+
+        Callers must hold ``_disk_schedules_lock``.
+        """
+        if self._disk_schedules is None:
+            self._disk_schedules = {}
+            if self._schedule_cache_path is not None and self._schedule_cache_path.exists():
+                try:
+                    schedules = json.loads(self._schedule_cache_path.read_text())
+                except (OSError, ValueError) as exc:
+                    logger.warning(
+                        "Ignoring unreadable schedule cache %s: %s",
+                        self._schedule_cache_path,
+                        exc,
+                    )
+                else:
+                    if isinstance(schedules, dict):
+                        self._disk_schedules = schedules
+                    else:
+                        logger.warning(
+                            "Ignoring malformed schedule cache %s", self._schedule_cache_path
+                        )
+        return self._disk_schedules
+
+    def _read_disk_schedule(self, key: tuple[int, int]) -> tuple[int, str | None] | None:
+        if self._schedule_cache_path is None:
+            return None
+        with self._disk_schedules_lock:
+            entry = self._load_disk_schedules().get(_disk_key(key))
+        # Entries of the wrong shape (hand-edited or from an older format) are
+        # treated as a miss and rediscovered
+        try:
+            if time.time() - entry["ts"] > SCHEDULE_CACHE_TTL_SECONDS:
+                return None
+            result = int(entry["window"]), entry.get("release_time")
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+        if result[1] is not None and not (
+            isinstance(result[1], str) and _HHMM_RE.fullmatch(result[1])
+        ):
+            return None
+        logger.info("Using cached schedule for venue %s (party of %s)", *key)
+        return result
+
+    def _write_disk_schedule(
+        self, key: tuple[int, int], result: tuple[int, str | None]
+    ) -> None:
+        if self._schedule_cache_path is None:
+            return
+        window_days, release_time = result
+        with self._disk_schedules_lock:
+            schedules = self._load_disk_schedules()
+            schedules[_disk_key(key)] = {
+                "window": window_days,
+                "release_time": release_time,
+                "ts": time.time(),
+            }
+            try:
+                self._atomic_write(self._schedule_cache_path, json.dumps(schedules))
+            except OSError as exc:
+                logger.warning(
+                    "Could not write schedule cache %s: %s", self._schedule_cache_path, exc
+                )
+
+    @staticmethod
+    def _atomic_write(path: Path, text: str) -> None:
+        """Replace ``path`` with ``text`` so readers never see a partial file."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(text)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _probe_find_venue(
+        self, venue_id: int, party_size: int, empty_days: set[int] | None = None
+    ) -> dict | None:
         """Make a /4/find request and return the first venue dict, or None.
 
         Tries dates at 7, 14, and 30 days out so that at least one probe
         falls within the booking window even for venues with short windows.
+        Days-out whose probe succeeded but returned no venue are added to
+        ``empty_days`` when it is given.
         """
         today = date.today()
         for days_out in [7, 14, 30]:
@@ -244,9 +549,11 @@ class ResyClient:
                 }
                 resp = self.session.get(f"{BASE_URL}/4/find", params=params, timeout=10)
                 resp.raise_for_status()
-                venues = resp.json().get("results", {}).get("venues", [])
+                venues = _decode(resp).get("results", {}).get("venues", [])
                 if venues:
                     return venues[0]
+                if empty_days is not None:
+                    empty_days.add(days_out)
             except Exception as exc:
                 logger.debug("Find probe at %d days failed for venue %s: %s", days_out, venue_id, exc)
         return None
@@ -258,18 +565,11 @@ class ResyClient:
         The templates field is a dict of string-keyed dicts:
           templates["1"]["content"]["en-us"]["need_to_know"]["body"]
         """
-        bodies: list[str] = []
-        for template in find_venue.get("templates", {}).values():
-            body = (
-                template
-                .get("content", {})
-                .get("en-us", {})
-                .get("need_to_know", {})
-                .get("body", "")
-            )
-            if body:
-                bodies.append(body)
-        return " ".join(bodies)
+        return "\n".join(
+            body
+            for template in find_venue.get("templates", {}).values()
+            if (body := _need_to_know_body(template))
+        )
 
     @staticmethod
     def _parse_window_days(text: str) -> int | None:
@@ -280,17 +580,11 @@ class ResyClient:
           - "books up to 28 days ahead"
           - "available 14 days before"
         """
-        patterns = [
-            r"(\d+)\s*days?\s+in\s+advance",
-            r"(\d+)\s*days?\s+ahead",
-            r"(\d+)\s*days?\s+before",
-            r"up\s+to\s+(\d+)\s*days?",
-            r"books?\s+(\d+)\s*days?",
-        ]
-        for pattern in patterns:
-            m = re.search(pattern, text)
-            if m:
-                return int(m.group(1))
+        matches = list(_WINDOW_RE.finditer(text))
+        for group in _WINDOW_PRIORITY:
+            for m in matches:
+                if m.group(group):
+                    return int(m.group(group))
         return None
 
     @staticmethod
@@ -303,25 +597,22 @@ class ResyClient:
           - "available at midnight"
           - "reservations released at 12:00am"
         """
-        # Handle "midnight" and "noon" shorthands
-        if re.search(r"(?:opens?|releases?|available|drops?)\s+at\s+midnight", text, re.IGNORECASE):
+        # Cheap substring scan first; most templates never mention a time
+        if not any(hint in text for hint in _RELEASE_HINTS):
+            return None
+        matches = list(_RELEASE_RE.finditer(text))
+        if any(m.group("midnight") for m in matches):
             return "00:00"
-        if re.search(r"(?:opens?|releases?|available|drops?)\s+at\s+noon", text, re.IGNORECASE):
+        if any(m.group("noon") for m in matches):
             return "12:00"
-
-        # Generic HH[:MM] am/pm pattern preceded by a keyword
-        m = re.search(
-            r"(?:opens?|releases?|available|drops?)\s+at\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)",
-            text,
-            re.IGNORECASE,
-        )
-        # Fallback: any "at Xam/pm" in the text (covers "30 days in advance at 9am ET")
-        if not m:
-            m = re.search(r"\bat\s+(\d{1,2})(?::(\d{2}))?\s*(am|pm)", text, re.IGNORECASE)
+        m = next((m for m in matches if m.group("hour")), None)
+        if m is None:
+            # Fallback: any "at Xam/pm" in the text (covers "30 days in advance at 9am ET")
+            m = _AT_TIME_RE.search(text)
         if m:
-            hour = int(m.group(1))
-            minute = int(m.group(2) or 0)
-            ampm = m.group(3).lower()
+            hour = int(m.group("hour"))
+            minute = int(m.group("minute") or 0)
+            ampm = m.group("ampm").lower()
             if ampm == "pm" and hour != 12:
                 hour += 12
             elif ampm == "am" and hour == 12:
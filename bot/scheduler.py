@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import bisect
+import functools
 import logging
+import random
+import threading
 import time
-from datetime import date, datetime, timedelta
-
-import pytz
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.interval import IntervalTrigger  # used by discovery job
+from collections.abc import Callable
+from concurrent import futures
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from zoneinfo import ZoneInfo
 
 from .config import AppConfig, Target
 from .resy_client import ResyClient, Slot
@@ -16,12 +18,62 @@ logger = logging.getLogger(__name__)
 
 # Snipe mode: retry for up to this many seconds after the release time fires
 SNIPE_WINDOW_SECONDS = 60
-SNIPE_RETRY_INTERVAL = 0.5   # seconds between attempts during snipe burst
-
-_WEEKDAY_MAP = {
-    "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
-    "Friday": 4, "Saturday": 5, "Sunday": 6,
-}
+# Delay between snipe attempts: starts short while a fresh release is most
+# likely to still have slots, then backs off geometrically (with jitter so
+# venues releasing at the same minute don't retry in lockstep)
+SNIPE_INITIAL_DELAY = 0.05
+SNIPE_MAX_DELAY = 2.0
+SNIPE_BACKOFF_FACTOR = 1.7
+SNIPE_JITTER = 0.02
+# Snipe bursts hold a thread for up to SNIPE_WINDOW_SECONDS, so they run on a
+# dedicated pool and can't starve polling/discovery on the default executor
+SNIPE_EXECUTOR = "snipe"
+SNIPE_MAX_WORKERS = 8
+# Floor for the default executor (polls, discoveries, prewarms).  Each target
+# can block up to a few of its threads at once; threads are cheap next to
+# the network waits they spend most of their time in
+DEFAULT_MIN_WORKERS = 32
+DEFAULT_WORKERS_PER_TARGET = 4
+
+# Snipe attempts allowed in flight at once; new ones are still staggered by
+# the backoff delay so they don't land on Resy in one simultaneous burst
+SNIPE_CONCURRENCY = 4
+
+# Open a connection to Resy this long before each snipe fires, so the first
+# (most valuable) attempt doesn't pay for DNS + TLS setup
+PREWARM_LEAD_SECONDS = 5
+
+# Upper bound on concurrent Resy calls fanned out from start(), and on the
+# shared lookup pool used by every target's _poll_job
+MAX_CONCURRENT_REQUESTS = 8
+
+# A discovery probe that first sees the date on the calendar is re-checked
+# after each of these (growing) delays until one agrees, before snipes are
+# scheduled; the total stays under the 5 s dense-probe cadence
+DISCOVERY_CONFIRM_DELAYS = (0.25, 0.5, 1.0)
+
+
+@functools.lru_cache(maxsize=64)
+def _tz(name: str) -> ZoneInfo:
+    """Return the (cached) ZoneInfo for an IANA timezone name."""
+    return ZoneInfo(name)
+
+
+def _infer_release_hour(now_local: datetime) -> int:
+    """Return the local hour a release detected at ``now_local`` belongs to.
+
+    A detection during :59 is a release landing just ahead of the hour, so it
+    rounds up; anything later belongs to the hour it was seen in.
+    """
+    if now_local.minute == 59:
+        return (now_local + timedelta(minutes=1)).hour
+    return now_local.hour
+
+
+def _next_snipe_delay(delay: float) -> float:
+    """Return the delay to use after ``delay``, clamped to the snipe bounds."""
+    jittered = delay * SNIPE_BACKOFF_FACTOR + random.uniform(-SNIPE_JITTER, SNIPE_JITTER)
+    return max(SNIPE_INITIAL_DELAY, min(SNIPE_MAX_DELAY, jittered))
 
 
 class Scheduler:
@@ -30,27 +82,80 @@ class Scheduler:
         client: ResyClient,
         config: AppConfig,
         payment_method_id: int,
+        clock: Callable[[], date] = date.today,
+        now: Callable[[tzinfo], datetime] = datetime.now,
     ) -> None:
         self.client = client
         self.config = config
         self.payment_method_id = payment_method_id
-        self._scheduler = BackgroundScheduler(timezone="UTC")
+        # Sources of "today" and of the current local time for scheduling
+        # decisions; injectable so tests can pin them without patching the
+        # datetime module
+        self._clock = clock
+        self._now = now
+        # APScheduler is imported here and in the _schedule_* helpers rather
+        # than at module load, so importing the module (e.g. for its helpers)
+        # doesn't pull in the scheduler stack.  By the time a helper runs,
+        # __init__ has loaded it, so those imports are sys.modules lookups.
+        from apscheduler.executors.pool import ThreadPoolExecutor
+        from apscheduler.schedulers.background import BackgroundScheduler
+
+        self._scheduler = BackgroundScheduler(
+            timezone="UTC",
+            executors={
+                "default": ThreadPoolExecutor(
+                    max_workers=max(
+                        DEFAULT_MIN_WORKERS, DEFAULT_WORKERS_PER_TARGET * len(config.targets)
+                    )
+                ),
+                SNIPE_EXECUTOR: ThreadPoolExecutor(max_workers=SNIPE_MAX_WORKERS),
+            },
+        )
         # Single flag: True once any booking succeeds; cancels all remaining jobs
         self._booked: bool = False
-        # Tracks whether the discovery probe found slots on the previous check
+        # Set once a booking succeeds or the bot shuts down; in-flight snipe
+        # bursts wait on it between attempts so they stop immediately
+        self._stop_event = threading.Event()
+        # Serialises the details -> book exchange so concurrent attempts (snipe
+        # pipelining, polling) can never make more than one reservation
+        self._booking_lock = threading.Lock()
         # Tracks whether the probe date was on the calendar on the previous
         # discovery check (keyed by venue_id so multi-target configs work)
         self._discovery_prev_on_calendar: dict[int, bool] = {}
+        # Venues whose release has been detected (or is being confirmed).  The
+        # hourly and dense discovery jobs are separate APScheduler jobs and can
+        # overlap, so the flip is claimed under _discovery_lock and snipes for
+        # a venue are only ever scheduled once
+        self._discovery_detected: set[int] = set()
+        self._discovery_lock = threading.Lock()
+        # Availability lookups from every target's poll job share one pool:
+        # threads and their pooled connections stay warm between ticks, and
+        # targets polling on the same tick are capped together
+        self._lookup_pool = futures.ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENT_REQUESTS, thread_name_prefix="lookup"
+        )
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
     def start(self) -> None:
-        for target in self.config.targets:
-            window_days, release_time_local = self.client.discover_venue_schedule(
-                target.venue_id, target.party_size
+        targets = self.config.targets
+        # Discover every venue's schedule concurrently; each is several round trips
+        with futures.ThreadPoolExecutor(
+            max_workers=max(1, min(MAX_CONCURRENT_REQUESTS, len(targets)))
+        ) as pool:
+            schedules = list(
+                pool.map(
+                    lambda t: self.client.discover_venue_schedule(t.venue_id, t.party_size),
+                    targets,
+                )
             )
+
+        today = self._clock()
+        for target_idx, (target, (window_days, release_time_local)) in enumerate(
+            zip(targets, schedules)
+        ):
             logger.info(
                 "Venue %s: booking_window=%d days, release_time=%s",
                 target.venue_name,
@@ -75,111 +180,142 @@ class Scheduler:
             )
 
             if release_time_local is not None:
+                # Parse "HH:MM" once per target, not once per snipe
+                hour, minute = map(int, release_time_local.split(":"))
                 # Schedule a snipe job for each candidate date's release day
-                tz = pytz.timezone(target.venue_timezone)
-                today = date.today()
                 for candidate_date in candidate_dates:
                     release_day = candidate_date - timedelta(days=window_days)
                     if release_day > today:
                         self._schedule_snipe(
-                            target, candidate_date, release_day, release_time_local, tz
+                            target_idx, candidate_date, release_day, hour, minute
                         )
             else:
                 # Release time unknown — start an hourly discovery job
-                self._schedule_discovery(target, window_days, candidate_dates)
+                self._schedule_discovery(target_idx, window_days)
 
             # Always schedule a polling job (handles post-window fallback)
-            self._schedule_polling(target, candidate_dates, window_days)
+            self._schedule_polling(target_idx, window_days)
 
         self._scheduler.start()
         logger.info("Scheduler started with %d job(s).", len(self._scheduler.get_jobs()))
 
     def shutdown(self) -> None:
+        self._stop_event.set()
         self._scheduler.shutdown(wait=False)
+        self._lookup_pool.shutdown(wait=False, cancel_futures=True)
         logger.info("Scheduler shut down.")
 
     # ------------------------------------------------------------------
     # Job scheduling helpers
+    #
+    # Jobs carry an index into config.targets (and a date ordinal for snipes)
+    # rather than the Target itself, so job args stay small and picklable.
     # ------------------------------------------------------------------
 
     def _schedule_snipe(
         self,
-        target: Target,
+        target_idx: int,
         candidate_date: date,
         release_day: date,
-        release_time_local: str,
-        tz: pytz.BaseTzInfo,
+        release_hour: int,
+        release_minute: int,
     ) -> None:
-        hour, minute = release_time_local.split(":")
-        local_dt = tz.localize(
-            datetime(
-                release_day.year, release_day.month, release_day.day,
-                int(hour), int(minute), 0,
-            )
+        from apscheduler.triggers.date import DateTrigger
+
+        target = self.config.targets[target_idx]
+        local_dt = datetime(
+            release_day.year, release_day.month, release_day.day,
+            release_hour, release_minute, 0,
+            tzinfo=_tz(target.venue_timezone),
+        )
+        utc_dt = local_dt.astimezone(timezone.utc)
+        self._scheduler.add_job(
+            self._prewarm_job,
+            trigger=DateTrigger(
+                run_date=utc_dt - timedelta(seconds=PREWARM_LEAD_SECONDS)
+            ),
+            args=[target_idx],
+            id=f"prewarm_{target.venue_id}_{candidate_date.isoformat()}",
+            name=f"Prewarm {target.venue_name} {candidate_date}",
+            misfire_grace_time=PREWARM_LEAD_SECONDS,
         )
-        utc_dt = local_dt.astimezone(pytz.utc)
         job_id = f"snipe_{target.venue_id}_{candidate_date.isoformat()}"
         self._scheduler.add_job(
             self._snipe_job,
-            trigger=CronTrigger(
-                year=utc_dt.year,
-                month=utc_dt.month,
-                day=utc_dt.day,
-                hour=utc_dt.hour,
-                minute=utc_dt.minute,
-                second=0,
-                timezone="UTC",
-            ),
-            args=[target, candidate_date.isoformat()],
+            # Each release fires exactly once; a DateTrigger drops itself afterwards
+            trigger=DateTrigger(run_date=utc_dt),
+            args=[target_idx, candidate_date.toordinal()],
             id=job_id,
             name=f"Snipe {target.venue_name} {candidate_date}",
+            executor=SNIPE_EXECUTOR,
             max_instances=1,
             misfire_grace_time=10,
         )
         logger.info(
-            "Scheduled snipe for %s on %s — release day %s at %s local / %s UTC",
+            "Scheduled snipe for %s on %s — release day %s at %02d:%02d local / %s UTC",
             target.venue_name,
             candidate_date,
             release_day,
-            release_time_local,
+            release_hour,
+            release_minute,
             utc_dt.strftime("%H:%M"),
         )
 
     def _schedule_discovery(
         self,
-        target: Target,
+        target_idx: int,
         window_days: int,
-        candidate_dates: list[date],
     ) -> None:
+        from apscheduler.triggers.cron import CronTrigger
+
+        target = self.config.targets[target_idx]
         self._discovery_prev_on_calendar[target.venue_id] = False
-        job_id = f"discover_{target.venue_id}"
+        # Releases cluster on the local hour: probe at :00:00, plus every 5 s
+        # from :59 through :01 so a release on either side of the hour is seen
+        # within seconds.  The triggers run in the venue's timezone so the
+        # hour they bracket is the one _discovery_job infers.
         self._scheduler.add_job(
             self._discovery_job,
-            trigger=IntervalTrigger(hours=1),
-            args=[target, window_days, candidate_dates],
-            id=job_id,
+            trigger=CronTrigger(minute=0, second=0, timezone=target.venue_timezone),
+            args=[target_idx, window_days],
+            id=f"discover_{target.venue_id}",
             name=f"Discover {target.venue_name}",
             max_instances=1,
         )
-        logger.info("Scheduled hourly discovery job for %s", target.venue_name)
+        self._scheduler.add_job(
+            self._discovery_job,
+            trigger=CronTrigger(
+                minute="59,0-1", second="*/5", timezone=target.venue_timezone
+            ),
+            args=[target_idx, window_days],
+            id=f"discover_dense_{target.venue_id}",
+            name=f"Discover {target.venue_name} (dense)",
+            max_instances=1,
+        )
+        logger.info(
+            "Scheduled discovery for %s — hourly at :00, every 5s from :59 to :01 local",
+            target.venue_name,
+        )
 
     def _schedule_polling(
         self,
-        target: Target,
-        candidate_dates: list[date],
+        target_idx: int,
         window_days: int,
     ) -> None:
+        from apscheduler.triggers.cron import CronTrigger
+
+        target = self.config.targets[target_idx]
         job_id = f"poll_{target.venue_id}"
         self._scheduler.add_job(
             self._poll_job,
             # Fire at :00:15, :10:15, :20:15, :30:15, :40:15, :50:15 every hour
             trigger=CronTrigger(minute="*/10", second=15, timezone="UTC"),
-            args=[target, candidate_dates, window_days],
+            args=[target_idx, window_days],
             id=job_id,
             name=f"Poll {target.venue_name}",
             max_instances=1,
             # Run immediately on startup; subsequent runs follow the cron schedule
-            next_run_time=datetime.now(pytz.utc),
+            next_run_time=datetime.now(timezone.utc),
         )
         logger.info(
             "Scheduled polling job for %s — running now, then every 10 min at :X0:15",
@@ -190,10 +326,24 @@ class Scheduler:
     # Job callables
     # ------------------------------------------------------------------
 
-    def _snipe_job(self, target: Target, date_str: str) -> None:
-        """Burst-retry booking for up to SNIPE_WINDOW_SECONDS after release fires."""
+    def _prewarm_job(self, target_idx: int) -> None:
+        """Establish a keep-alive connection just before a snipe fires."""
         if self._booked:
             return
+        target = self.config.targets[target_idx]
+        try:
+            self.client.warm_up(target.venue_id)
+        except Exception as exc:
+            # Not fatal: the snipe's first attempt just opens its own connection
+            logger.debug("Prewarm failed for %s: %s", target.venue_name, exc)
+
+    def _snipe_job(self, target_idx: int, candidate_ord: int) -> None:
+        """Burst-retry booking for up to SNIPE_WINDOW_SECONDS after release fires."""
+        # _stop_event also covers shutdown, which never sets _booked
+        if self._booked or self._stop_event.is_set():
+            return
+        target = self.config.targets[target_idx]
+        date_str = date.fromordinal(candidate_ord).isoformat()
         logger.info(
             "Snipe window opened for %s %s — bursting for %ds",
             target.venue_name,
@@ -202,36 +352,75 @@ class Scheduler:
         )
         deadline = time.monotonic() + SNIPE_WINDOW_SECONDS
         attempt = 0
-        while time.monotonic() < deadline:
-            attempt += 1
-            logger.debug("Snipe attempt %d for %s %s", attempt, target.venue_name, date_str)
-            if self._attempt_booking(target, date_str):
-                return
-            time.sleep(SNIPE_RETRY_INTERVAL)
-        logger.warning(
-            "Snipe window closed for %s %s without a successful booking.",
-            target.venue_name,
-            date_str,
-        )
+        delay = SNIPE_INITIAL_DELAY
+        in_flight: set[futures.Future] = set()
+        with futures.ThreadPoolExecutor(max_workers=SNIPE_CONCURRENCY) as pool:
+            while True:
+                if len(in_flight) < SNIPE_CONCURRENCY:
+                    attempt += 1
+                    logger.debug(
+                        "Snipe attempt %d for %s %s", attempt, target.venue_name, date_str
+                    )
+                    in_flight.add(pool.submit(self._attempt_booking, target, date_str))
+                # Never sleep past the deadline; wake at once if anything books
+                remaining = max(0.0, deadline - time.monotonic())
+                if self._stop_event.wait(min(delay, remaining)):
+                    return
+                if time.monotonic() >= deadline:
+                    break
+                in_flight = {f for f in in_flight if not f.done()}
+                delay = _next_snipe_delay(delay)
+        # Leaving the pool waited for stragglers, one of which may have booked
+        if not self._stop_event.is_set():
+            logger.warning(
+                "Snipe window closed for %s %s without a successful booking.",
+                target.venue_name,
+                date_str,
+            )
 
-    def _poll_job(
-        self, target: Target, candidate_dates: list[date], window_days: int
-    ) -> None:
-        """Check each candidate date that's currently within the booking window."""
-        if self._booked:
+    def _poll_job(self, target_idx: int, window_days: int) -> None:
+        """Check each candidate date that's currently within the booking window.
+
+        Availability for all in-window dates is fetched concurrently; the first
+        response with a preferred slot is booked and queued lookups are dropped.
+        """
+        # _stop_event also covers shutdown, after which _lookup_pool rejects work
+        if self._booked or self._stop_event.is_set():
             return
-        today = date.today()
-        for candidate_date in candidate_dates:
-            if self._booked:
-                return
-            days_until = (candidate_date - today).days
-            if 0 <= days_until <= window_days:
-                if self._attempt_booking(target, candidate_date.isoformat()):
+        target = self.config.targets[target_idx]
+        # candidate_dates is sorted, so the in-window dates are one contiguous slice
+        today = self._clock()
+        dates = target.candidate_dates
+        lo = bisect.bisect_left(dates, today)
+        hi = bisect.bisect_right(dates, today + timedelta(days=window_days), lo)
+        if lo == hi:
+            return
+        try:
+            pending = {
+                self._lookup_pool.submit(self._find_preferred_slot, target, d.isoformat()): d
+                for d in dates[lo:hi]
+            }
+        except RuntimeError:
+            # shutdown() closed the pool between the check above and here
+            return
+        try:
+            for future in futures.as_completed(pending):
+                if self._booked:
                     return
+                # Lookups cancelled by shutdown() have no result to read
+                if future.cancelled():
+                    continue
+                slot = future.result()
+                if slot is not None and self._book_slot(
+                    target, pending[future].isoformat(), slot
+                ):
+                    return
+        finally:
+            # Drop lookups still queued; the pool outlives this tick
+            for future in pending:
+                future.cancel()
 
-    def _discovery_job(
-        self, target: Target, window_days: int, candidate_dates: list[date]
-    ) -> None:
+    def _discovery_job(self, target_idx: int, window_days: int) -> None:
         """Probe whether the next candidate date has appeared on the calendar.
 
         Resy shows a date on the calendar (with 0 available slots) the moment
@@ -241,41 +430,76 @@ class Scheduler:
         """
         if self._booked:
             return
-        today = date.today()
+        target = self.config.targets[target_idx]
+        if target.venue_id in self._discovery_detected:
+            return
+        today = self._clock()
         probe_date = today + timedelta(days=window_days)
-        try:
-            on_calendar = self.client.is_date_on_calendar(
-                target.venue_id, probe_date.isoformat(), target.party_size
-            )
-        except Exception as exc:
-            logger.debug("Discovery probe failed for %s: %s", target.venue_name, exc)
+        on_calendar = self._probe_calendar(target, probe_date)
+        if on_calendar is None:
             return
 
-        prev_on_calendar = self._discovery_prev_on_calendar.get(target.venue_id, False)
-        self._discovery_prev_on_calendar[target.venue_id] = on_calendar
+        with self._discovery_lock:
+            if target.venue_id in self._discovery_detected:
+                return
+            prev_on_calendar = self._discovery_prev_on_calendar.get(target.venue_id, False)
+            self._discovery_prev_on_calendar[target.venue_id] = on_calendar
+            if not on_calendar or prev_on_calendar:
+                return
+            self._discovery_detected.add(target.venue_id)
 
-        if on_calendar and not prev_on_calendar:
-            tz = pytz.timezone(target.venue_timezone)
-            now_local = datetime.now(tz)
-            inferred_release_time = f"{now_local.hour:02d}:00"
+        # A single positive probe may be a glitch; re-probe quickly before
+        # committing to a release hour
+        if not self._confirm_on_calendar(target, probe_date):
             logger.info(
-                "Discovery: %s appeared on calendar for %s at ~%s local — scheduling snipes",
+                "Discovery: %s flipped onto the calendar for %s but was not confirmed",
                 probe_date,
                 target.venue_name,
-                inferred_release_time,
             )
-            # Remove the discovery job
+            with self._discovery_lock:
+                self._discovery_detected.discard(target.venue_id)
+                self._discovery_prev_on_calendar[target.venue_id] = False
+            return
+
+        inferred_hour = _infer_release_hour(self._now(_tz(target.venue_timezone)))
+        logger.info(
+            "Discovery: %s appeared on calendar for %s at ~%02d:00 local — scheduling snipes",
+            probe_date,
+            target.venue_name,
+            inferred_hour,
+        )
+        # Remove both discovery jobs
+        for job_id in (f"discover_{target.venue_id}", f"discover_dense_{target.venue_id}"):
             try:
-                self._scheduler.remove_job(f"discover_{target.venue_id}")
+                self._scheduler.remove_job(job_id)
             except Exception:
                 pass
-            # Schedule snipe jobs for all future candidate dates
-            for candidate_date in candidate_dates:
-                release_day = candidate_date - timedelta(days=window_days)
-                if release_day > today:
-                    self._schedule_snipe(
-                        target, candidate_date, release_day, inferred_release_time, tz
-                    )
+        # Schedule snipe jobs for all future candidate dates
+        for candidate_date in target.candidate_dates:
+            release_day = candidate_date - timedelta(days=window_days)
+            if release_day > today:
+                self._schedule_snipe(
+                    target_idx, candidate_date, release_day, inferred_hour, 0
+                )
+
+    def _probe_calendar(self, target: Target, probe_date: date) -> bool | None:
+        """Return whether probe_date is on target's calendar, or None if the probe failed."""
+        try:
+            return self.client.is_date_on_calendar(
+                target.venue_id, probe_date.isoformat(), target.party_size
+            )
+        except Exception as exc:
+            logger.debug("Discovery probe failed for %s: %s", target.venue_name, exc)
+            return None
+
+    def _confirm_on_calendar(self, target: Target, probe_date: date) -> bool:
+        """Re-probe after each of DISCOVERY_CONFIRM_DELAYS; True once one agrees."""
+        for delay in DISCOVERY_CONFIRM_DELAYS:
+            if self._stop_event.wait(delay):
+                return False
+            if self._probe_calendar(target, probe_date):
+                return True
+        return False
 
     # ------------------------------------------------------------------
     # Core booking logic
@@ -286,14 +510,21 @@ class Scheduler:
 
         Returns True on success, False otherwise.
         """
+        slot = self._find_preferred_slot(target, date_str)
+        if slot is None:
+            return False
+        return self._book_slot(target, date_str, slot)
+
+    def _find_preferred_slot(self, target: Target, date_str: str) -> Slot | None:
+        """Fetch availability for date_str and return the preferred slot, if any."""
         try:
             slots = self.client.find_slots(target.venue_id, date_str, target.party_size)
         except Exception as exc:
             logger.error("find_slots failed for %s: %s", target.venue_name, exc)
-            return False
+            return None
 
         slot = self._pick_preferred_slot(
-            slots, target.time_center, target.time_radius_minutes
+            slots, target.time_center_minutes, target.time_radius_minutes
         )
         if slot is None:
             logger.info(
@@ -303,8 +534,16 @@ class Scheduler:
                 target.time_center,
                 target.time_radius_minutes,
             )
-            return False
+        return slot
 
+    def _book_slot(self, target: Target, date_str: str, slot: Slot) -> bool:
+        """Exchange slot for a booking token and book it.  Returns True on success."""
+        with self._booking_lock:
+            if self._booked:
+                return False
+            return self._book_slot_locked(target, date_str, slot)
+
+    def _book_slot_locked(self, target: Target, date_str: str, slot: Slot) -> bool:
         logger.info(
             "Preferred slot found: %s at %s on %s — attempting to book",
             target.venue_name,
@@ -328,23 +567,27 @@ class Scheduler:
             confirmation,
         )
         self._booked = True
+        self._stop_event.set()
         self._cancel_all_jobs()
         return True
 
+    @staticmethod
     def _pick_preferred_slot(
-        self, slots: list[Slot], time_center: str, radius_minutes: int
+        slots: list[Slot], center_minutes: int, radius_minutes: int
     ) -> Slot | None:
-        """Return the slot closest to time_center within ±radius_minutes, or None."""
-        center_h, center_m = time_center.split(":")
-        center_total = int(center_h) * 60 + int(center_m)
-
+        """Return the slot closest to center_minutes (past midnight) within
+        ±radius_minutes, or None."""
         best_slot: Slot | None = None
-        best_distance = float("inf")
+        # Anything at or beyond radius + 1 is out of range, so one comparison
+        # covers both "within radius" and "closer than the best so far"
+        best_distance = radius_minutes + 1
 
         for slot in slots:
-            slot_total = slot.start_time.hour * 60 + slot.start_time.minute
-            distance = abs(slot_total - center_total)
-            if distance <= radius_minutes and distance < best_distance:
+            start = slot.start_time
+            distance = abs(start.hour * 60 + start.minute - center_minutes)
+            if distance < best_distance:
+                if distance == 0:
+                    return slot
                 best_distance = distance
                 best_slot = slot
 
@@ -352,26 +595,12 @@ class Scheduler:
 
     def _generate_candidate_dates(self, target: Target) -> list[date]:
         """Return all dates in [start_date, end_date] that fall on days_of_week."""
-        start = date.fromisoformat(target.start_date)
-        end = date.fromisoformat(target.end_date)
-        wanted = {_WEEKDAY_MAP[day] for day in target.days_of_week}
-
-        candidates: list[date] = []
-        current = start
-        while current <= end:
-            if current.weekday() in wanted:
-                candidates.append(current)
-            current += timedelta(days=1)
-        return candidates
+        return target.candidate_dates
 
     def _cancel_all_jobs(self) -> None:
         """Remove every job from the scheduler."""
         try:
-            for job in list(self._scheduler.get_jobs()):
-                try:
-                    self._scheduler.remove_job(job.id)
-                except Exception:
-                    pass
+            self._scheduler.remove_all_jobs()
             logger.info("All scheduler jobs cancelled.")
         except Exception as exc:
             logger.warning("Error cancelling jobs: %s", exc)
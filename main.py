@@ -21,6 +21,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+SCHEDULE_CACHE_PATH = "~/.cache/resy-bot/venue_schedule.json"
+
 
 def _require_env(name: str) -> str:
     value = os.getenv(name)
@@ -40,27 +42,32 @@ def main() -> None:
     config = load_config("config.yaml")
     logger.info("Loaded %d target(s) from config.yaml", len(config.targets))
 
-    client = ResyClient(api_key=resy_api_key, auth_token=resy_auth_token)
-
-    scheduler = Scheduler(
-        client=client,
-        config=config,
-        payment_method_id=payment_method_id,
-    )
-
-    def _shutdown(signum: int, frame: object) -> None:
-        logger.info("Received signal %d — shutting down.", signum)
-        scheduler.shutdown()
-        sys.exit(0)
-
-    signal.signal(signal.SIGINT, _shutdown)
-    signal.signal(signal.SIGTERM, _shutdown)
-
-    scheduler.start()
-    logger.info("Bot is running. Press Ctrl+C to stop.")
-
-    while True:
-        time.sleep(1)
+    # One client (and so one keep-alive connection pool) for the whole run;
+    # the with-block closes it when a signal handler exits the process.
+    with ResyClient(
+        api_key=resy_api_key,
+        auth_token=resy_auth_token,
+        schedule_cache_path=SCHEDULE_CACHE_PATH,
+    ) as client:
+        scheduler = Scheduler(
+            client=client,
+            config=config,
+            payment_method_id=payment_method_id,
+        )
+
+        def _shutdown(signum: int, frame: object) -> None:
+            logger.info("Received signal %d — shutting down.", signum)
+            scheduler.shutdown()
+            sys.exit(0)
+
+        signal.signal(signal.SIGINT, _shutdown)
+        signal.signal(signal.SIGTERM, _shutdown)
+
+        scheduler.start()
+        logger.info("Bot is running. Press Ctrl+C to stop.")
+
+        while True:
+            time.sleep(1)
 
 
 if __name__ == "__main__":
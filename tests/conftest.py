@@ -0,0 +1,22 @@
+"""Shared pytest fixtures."""
+from __future__ import annotations
+
+import pytest
+
+from bot.resy_client import ResyClient
+
+
+@pytest.fixture(scope="session")
+def _session_client():
+    # Built once: constructing a requests.Session and mounting adapters per
+    # test adds up.  Tests patch session methods with context managers or
+    # monkeypatch, which revert on exit, so sharing stays isolated.
+    with ResyClient(api_key="test-key", auth_token="test-token") as client:
+        yield client
+
+
+@pytest.fixture
+def client(_session_client: ResyClient) -> ResyClient:
+    """The shared ResyClient, with its per-venue schedule cache cleared."""
+    _session_client._schedule_cache.clear()
+    return _session_client
@@ -1,13 +1,15 @@
 """Tests for bot/config.py — Pydantic model validation and YAML loading."""
 from __future__ import annotations
 
-import textwrap
+import os
+from datetime import date
 from pathlib import Path
 
 import pytest
+import yaml
 from pydantic import ValidationError
 
-from bot.config import AppConfig, Target, load_config
+from bot.config import AppConfig, Target, _yaml_loader, load_config, load_config_trusted
 
 
 # ---------------------------------------------------------------------------
@@ -28,6 +30,11 @@ VALID_TARGET_KWARGS = dict(
 )
 
 
+def error_fields(exc: ValidationError) -> set[str]:
+    """Top-level field names that failed, read from errors() rather than str(exc)."""
+    return {e["loc"][0] for e in exc.errors()}
+
+
 def test_target_valid():
     t = Target(**VALID_TARGET_KWARGS)
     assert t.venue_id == 5286
@@ -37,23 +44,56 @@ def test_target_valid():
 
 
 def test_target_invalid_start_date():
-    with pytest.raises(ValidationError, match="start_date"):
+    with pytest.raises(ValidationError) as exc_info:
         Target(**{**VALID_TARGET_KWARGS, "start_date": "not-a-date"})
+    assert error_fields(exc_info.value) == {"start_date"}
 
 
 def test_target_invalid_end_date():
-    with pytest.raises(ValidationError, match="end_date"):
+    with pytest.raises(ValidationError) as exc_info:
         Target(**{**VALID_TARGET_KWARGS, "end_date": "not-a-date"})
+    assert error_fields(exc_info.value) == {"end_date"}
+
+
+def test_target_time_center_minutes():
+    t = Target(**{**VALID_TARGET_KWARGS, "time_center": "19:45"})
+    assert t.time_center_minutes == 19 * 60 + 45
+
+
+def test_target_is_frozen():
+    t = Target(**VALID_TARGET_KWARGS)
+    with pytest.raises(ValidationError):
+        t.party_size = 4
 
 
 def test_target_invalid_time_center():
-    with pytest.raises(ValidationError, match="time_center"):
+    with pytest.raises(ValidationError) as exc_info:
         Target(**{**VALID_TARGET_KWARGS, "time_center": "25:00"})
+    assert error_fields(exc_info.value) == {"time_center"}
 
 
 def test_target_invalid_days_of_week():
-    with pytest.raises(ValidationError, match="days_of_week"):
+    with pytest.raises(ValidationError) as exc_info:
         Target(**{**VALID_TARGET_KWARGS, "days_of_week": ["Blursday"]})
+    assert error_fields(exc_info.value) == {"days_of_week"}
+
+
+def test_target_candidate_dates_computed_at_validation():
+    t = Target(**{**VALID_TARGET_KWARGS, "start_date": "2026-03-01", "end_date": "2026-03-14"})
+    # Tuesdays and Thursdays in the first two weeks of March 2026
+    assert t.candidate_dates == [
+        date(2026, 3, 3), date(2026, 3, 5), date(2026, 3, 10), date(2026, 3, 12),
+    ]
+
+
+def test_target_weekday_mask():
+    t = Target(**{**VALID_TARGET_KWARGS, "days_of_week": ["Monday", "Wednesday", "Sunday"]})
+    assert t.weekday_mask == 0b1000101
+
+
+def test_target_candidate_dates_empty_when_end_before_start():
+    t = Target(**{**VALID_TARGET_KWARGS, "start_date": "2026-04-30", "end_date": "2026-03-01"})
+    assert t.candidate_dates == []
 
 
 def test_target_defaults():
@@ -71,30 +111,49 @@ def test_target_defaults():
     assert t.poll_interval_seconds == 60
 
 
-def test_target_all_weekdays_valid():
-    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
-        t = Target(**{**VALID_TARGET_KWARGS, "days_of_week": [day]})
-        assert t.days_of_week == [day]
+@pytest.mark.parametrize(
+    "day", ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+)
+def test_target_all_weekdays_valid(day):
+    t = Target(**{**VALID_TARGET_KWARGS, "days_of_week": [day]})
+    assert t.days_of_week == [day]
 
 
 # ---------------------------------------------------------------------------
 # load_config
 # ---------------------------------------------------------------------------
 
-MINIMAL_YAML = textwrap.dedent("""\
-    targets:
-      - venue_id: 1
-        venue_name: "Test Venue"
-        start_date: "2026-06-01"
-        end_date: "2026-08-31"
-        party_size: 2
-        days_of_week:
-          - "Tuesday"
-          - "Thursday"
-        time_center: "19:00"
-        time_radius_minutes: 30
-        poll_interval_seconds: 30
-""")
+MINIMAL_YAML = """\
+targets:
+  - venue_id: 1
+    venue_name: "Test Venue"
+    start_date: "2026-06-01"
+    end_date: "2026-08-31"
+    party_size: 2
+    days_of_week:
+      - "Tuesday"
+      - "Thursday"
+    time_center: "19:00"
+    time_radius_minutes: 30
+    poll_interval_seconds: 30
+"""
+
+# MINIMAL_YAML as load_config parses it, for tests that don't exercise YAML
+MINIMAL_CONFIG = {
+    "targets": [
+        {
+            "venue_id": 1,
+            "venue_name": "Test Venue",
+            "start_date": "2026-06-01",
+            "end_date": "2026-08-31",
+            "party_size": 2,
+            "days_of_week": ["Tuesday", "Thursday"],
+            "time_center": "19:00",
+            "time_radius_minutes": 30,
+            "poll_interval_seconds": 30,
+        }
+    ]
+}
 
 
 def test_load_config(tmp_path: Path):
@@ -107,6 +166,87 @@ def test_load_config(tmp_path: Path):
     assert cfg.targets[0].days_of_week == ["Tuesday", "Thursday"]
 
 
+def test_load_config_matches_preparsed(tmp_path: Path):
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(MINIMAL_YAML)
+    assert load_config(cfg_file) == AppConfig.model_validate(MINIMAL_CONFIG)
+
+
+def test_app_config_from_preparsed():
+    cfg = AppConfig.model_validate(MINIMAL_CONFIG)
+    assert cfg.targets[0].candidate_dates[0] == date(2026, 6, 2)
+    assert cfg.targets[0].weekday_mask == 0b0001010
+
+
+def test_load_config_ignores_unknown_sections(tmp_path: Path):
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(MINIMAL_YAML + "unused:\n  nested: [1, 2, 3]\n")
+    cfg = load_config(cfg_file)
+    assert len(cfg.targets) == 1
+
+
+def test_load_config_rejects_non_mapping(tmp_path: Path):
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text("- just\n- a list\n")
+    with pytest.raises(ValidationError):
+        load_config(cfg_file)
+
+
+def test_load_config_cached_until_file_changes(tmp_path: Path):
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(MINIMAL_YAML)
+    first = load_config(cfg_file)
+    assert load_config(cfg_file) is first
+    cfg_file.write_text(MINIMAL_YAML.replace("Test Venue", "Renamed Venue"))
+    assert load_config(cfg_file).targets[0].venue_name == "Renamed Venue"
+
+
+def test_app_config_is_frozen():
+    cfg = AppConfig.model_validate(MINIMAL_CONFIG)
+    with pytest.raises(ValidationError):
+        cfg.targets = []
+
+
+def test_yaml_loader_warns_without_libyaml(monkeypatch, caplog):
+    monkeypatch.setattr(yaml, "__with_libyaml__", False)
+    _yaml_loader.cache_clear()
+    try:
+        assert _yaml_loader() is yaml.SafeLoader
+    finally:
+        _yaml_loader.cache_clear()
+    assert "libyaml" in caplog.text
+
+
 def test_load_config_missing_file():
     with pytest.raises(FileNotFoundError):
         load_config("/nonexistent/path/config.yaml")
+
+
+def test_load_config_trusted_reuses_validated_config(tmp_path: Path):
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(MINIMAL_YAML)
+    first = load_config_trusted(cfg_file)
+    second = load_config_trusted(cfg_file)
+    assert first is second
+    assert first.targets[0].venue_name == "Test Venue"
+
+
+def test_load_config_trusted_revalidates_changed_content(tmp_path: Path):
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(MINIMAL_YAML)
+    first = load_config_trusted(cfg_file)
+    cfg_file.write_text(MINIMAL_YAML.replace("Test Venue", "Other Venue"))
+    second = load_config_trusted(cfg_file)
+    assert second is not first
+    assert second.targets[0].venue_name == "Other Venue"
+
+
+def test_load_config_shares_validated_config_with_trusted_loader(tmp_path: Path):
+    """Touching a file re-reads it but reuses the config validated for its content."""
+    cfg_file = tmp_path / "config.yaml"
+    cfg_file.write_text(MINIMAL_YAML.replace("Test Venue", "Touched Venue"))
+    first = load_config(cfg_file)
+    st = cfg_file.stat()
+    os.utime(cfg_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert load_config(cfg_file) is first
+    assert load_config_trusted(cfg_file) is first
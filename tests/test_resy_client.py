@@ -1,25 +1,41 @@
 """Tests for bot/resy_client.py — API response parsing and request construction."""
 from __future__ import annotations
 
-from datetime import datetime
+import dataclasses
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
 import requests
 
-from bot.resy_client import ResyClient, Slot
+from bot.resy_client import BASE_URL, ResyClient, Slot
 
 
-def make_client() -> ResyClient:
-    return ResyClient(api_key="test-key", auth_token="test-token")
+class FakeResponse:
+    """Just enough of requests.Response for ResyClient; far cheaper than a MagicMock."""
 
+    __slots__ = ("status_code", "content", "_json")
 
-def mock_response(json_data: dict, status_code: int = 200) -> MagicMock:
-    resp = MagicMock()
-    resp.status_code = status_code
-    resp.json.return_value = json_data
-    resp.raise_for_status.return_value = None
-    return resp
+    def __init__(self, json_data: dict, status_code: int = 200) -> None:
+        self.status_code = status_code
+        self.content = json.dumps(json_data).encode()
+        self._json = json_data
+
+    def json(self) -> dict:
+        return self._json
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+def mock_response(json_data: dict, status_code: int = 200) -> FakeResponse:
+    return FakeResponse(json_data, status_code)
+
+
+# Payloads shared across tests are built once at import; tests must not mutate them
+EMPTY_FIND_RESPONSE = {"results": {"venues": []}}
 
 
 # ---------------------------------------------------------------------------
@@ -33,33 +49,64 @@ def test_client_sets_auth_headers():
     assert headers["X-Resy-Auth-Token"] == "mytoken"
 
 
+def test_client_mounts_pooled_https_adapter(client):
+    adapter = client.session.get_adapter(BASE_URL)
+    assert adapter._pool_maxsize == 32
+
+
+def test_client_retries_gateway_errors_on_get_only(client):
+    retry = client.session.get_adapter(BASE_URL).max_retries
+    assert 503 in retry.status_forcelist
+    assert retry.is_retry("GET", 503)
+    assert not retry.is_retry("POST", 503)
+
+
+def test_client_context_manager_closes_session(client):
+    with patch.object(client.session, "close") as mock_close:
+        with client:
+            pass
+    mock_close.assert_called_once()
+
+
+def test_warm_up_requests_venue_endpoint(client):
+    with patch.object(client.session, "get", return_value=mock_response({})) as mock_get:
+        client.warm_up(5286)
+    args, kwargs = mock_get.call_args
+    assert args[0] == f"{BASE_URL}/3/venue"
+    assert kwargs["params"] == {"venue_id": 5286}
+
+
 # ---------------------------------------------------------------------------
 # is_date_on_calendar
 # ---------------------------------------------------------------------------
 
-def test_is_date_on_calendar_true_when_venue_present():
+def test_is_date_on_calendar_true_when_venue_present(client):
     """Returns True when the venue appears in results, even with no slots."""
-    client = make_client()
     data = {"results": {"venues": [{"slots": []}]}}  # venue present, fully booked
     with patch.object(client.session, "get", return_value=mock_response(data)):
         assert client.is_date_on_calendar(5286, "2026-03-15", 2) is True
 
 
-def test_is_date_on_calendar_true_with_available_slots():
+def test_is_date_on_calendar_true_with_available_slots(client):
     """Returns True when the venue has open slots."""
-    client = make_client()
     with patch.object(client.session, "get", return_value=mock_response(FIND_SLOTS_RESPONSE)):
         assert client.is_date_on_calendar(5286, "2026-03-15", 2) is True
 
 
-def test_is_date_on_calendar_false_when_no_venues():
+def test_is_date_on_calendar_false_when_no_venues(client):
     """Returns False when date is outside the booking window (no venues returned)."""
-    client = make_client()
-    data = {"results": {"venues": []}}
-    with patch.object(client.session, "get", return_value=mock_response(data)):
+    with patch.object(client.session, "get", return_value=mock_response(EMPTY_FIND_RESPONSE)):
         assert client.is_date_on_calendar(5286, "2026-03-15", 2) is False
 
 
+def test_is_date_on_calendar_empty_body_skips_json_decode(client):
+    resp = mock_response(EMPTY_FIND_RESPONSE)
+    with patch.object(client.session, "get", return_value=resp):
+        with patch("bot.resy_client._decode") as mock_decode:
+            assert client.is_date_on_calendar(5286, "2026-03-15", 2) is False
+    mock_decode.assert_not_called()
+
+
 # ---------------------------------------------------------------------------
 # find_slots
 # ---------------------------------------------------------------------------
@@ -87,10 +134,34 @@ FIND_SLOTS_RESPONSE = {
     }
 }
 
+MISSING_TOKEN_RESPONSE = {
+    "results": {
+        "venues": [
+            {
+                "slots": [
+                    {"config": {}, "date": {"start": "2026-03-15 19:00:00"}},  # no token
+                    {"config": {"token": "cfg-ok"}, "date": {"start": "2026-03-15 20:00:00"}},
+                ]
+            }
+        ]
+    }
+}
 
+BAD_DATE_RESPONSE = {
+    "results": {
+        "venues": [
+            {
+                "slots": [
+                    {"config": {"token": "cfg-bad"}, "date": {"start": "not-a-date"}},
+                    {"config": {"token": "cfg-ok"}, "date": {"start": "2026-03-15 20:00:00"}},
+                ]
+            }
+        ]
+    }
+}
 
-def test_find_slots_returns_slots():
-    client = make_client()
+
+def test_find_slots_returns_slots(client):
     with patch.object(client.session, "get", return_value=mock_response(FIND_SLOTS_RESPONSE)):
         slots = client.find_slots(venue_id=5286, date="2026-03-15", party_size=2)
 
@@ -101,57 +172,63 @@ def test_find_slots_returns_slots():
     assert slots[1].start_time == datetime(2026, 3, 15, 20, 0, 0)
 
 
-def test_find_slots_skips_missing_config_token():
-    data = {
-        "results": {
-            "venues": [
-                {
-                    "slots": [
-                        {"config": {}, "date": {"start": "2026-03-15 19:00:00"}},  # no token
-                        {"config": {"token": "cfg-ok"}, "date": {"start": "2026-03-15 20:00:00"}},
-                    ]
-                }
-            ]
-        }
-    }
-    client = make_client()
-    with patch.object(client.session, "get", return_value=mock_response(data)):
+def test_slot_has_no_instance_dict():
+    slot = Slot(config_id="cfg", start_time=datetime(2026, 3, 15, 19, 0))
+    assert not hasattr(slot, "__dict__")
+    assert slot.token is None
+
+
+def test_slot_is_frozen_and_hashable():
+    slot = Slot(config_id="cfg", start_time=datetime(2026, 3, 15, 19, 0))
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        slot.token = "tok"
+    assert {slot, Slot(config_id="cfg", start_time=datetime(2026, 3, 15, 19, 0))} == {slot}
+
+
+def test_find_slots_skips_missing_config_token(client):
+    with patch.object(client.session, "get", return_value=mock_response(MISSING_TOKEN_RESPONSE)):
+        slots = client.find_slots(5286, "2026-03-15", 2)
+
+    assert len(slots) == 1
+    assert slots[0].config_id == "cfg-ok"
+
+
+def test_find_slots_skips_bad_date(client):
+    with patch.object(client.session, "get", return_value=mock_response(BAD_DATE_RESPONSE)):
         slots = client.find_slots(5286, "2026-03-15", 2)
 
     assert len(slots) == 1
     assert slots[0].config_id == "cfg-ok"
 
 
-def test_find_slots_skips_bad_date():
+def test_find_slots_skips_malformed_slot_entries(client, caplog):
     data = {
         "results": {
             "venues": [
                 {
                     "slots": [
-                        {"config": {"token": "cfg-bad"}, "date": {"start": "not-a-date"}},
+                        {"config": {"token": "cfg-no-date"}},
+                        {"config": None, "date": {"start": "2026-03-15 19:00:00"}},
                         {"config": {"token": "cfg-ok"}, "date": {"start": "2026-03-15 20:00:00"}},
                     ]
                 }
             ]
         }
     }
-    client = make_client()
     with patch.object(client.session, "get", return_value=mock_response(data)):
         slots = client.find_slots(5286, "2026-03-15", 2)
 
-    assert len(slots) == 1
-    assert slots[0].config_id == "cfg-ok"
+    assert [s.config_id for s in slots] == ["cfg-ok"]
+    assert "cfg-no-date" in caplog.text
 
 
-def test_find_slots_empty_venues():
-    client = make_client()
-    with patch.object(client.session, "get", return_value=mock_response({"results": {"venues": []}})):
+def test_find_slots_empty_venues(client):
+    with patch.object(client.session, "get", return_value=mock_response(EMPTY_FIND_RESPONSE)):
         slots = client.find_slots(5286, "2026-03-15", 2)
     assert slots == []
 
 
-def test_find_slots_raises_on_http_error():
-    client = make_client()
+def test_find_slots_raises_on_http_error(client):
     resp = MagicMock()
     resp.raise_for_status.side_effect = requests.HTTPError("403")
     with patch.object(client.session, "get", return_value=resp):
@@ -159,20 +236,52 @@ def test_find_slots_raises_on_http_error():
             client.find_slots(5286, "2026-03-15", 2)
 
 
+# ---------------------------------------------------------------------------
+# find_slots_batch
+# ---------------------------------------------------------------------------
+
+def test_find_slots_batch_preserves_query_order(client):
+    def fake_get(url, **kwargs):
+        if kwargs["params"]["day"] == "2026-03-15":
+            return mock_response(FIND_SLOTS_RESPONSE)
+        return mock_response(EMPTY_FIND_RESPONSE)
+
+    with patch.object(client.session, "get", side_effect=fake_get):
+        results = client.find_slots_batch([(5286, "2026-03-14", 2), (5286, "2026-03-15", 2)])
+
+    assert results[0] == []
+    assert [s.config_id for s in results[1]] == ["cfg-abc", "cfg-def"]
+
+
+def test_find_slots_batch_failed_query_yields_none(client):
+    def fake_get(url, **kwargs):
+        if kwargs["params"]["day"] == "2026-03-14":
+            raise requests.ConnectionError("boom")
+        return mock_response(FIND_SLOTS_RESPONSE)
+
+    with patch.object(client.session, "get", side_effect=fake_get):
+        results = client.find_slots_batch([(5286, "2026-03-14", 2), (5286, "2026-03-15", 2)])
+
+    assert results[0] is None
+    assert len(results[1]) == 2
+
+
+def test_find_slots_batch_empty(client):
+    assert client.find_slots_batch([]) == []
+
+
 # ---------------------------------------------------------------------------
 # get_booking_token
 # ---------------------------------------------------------------------------
 
-def test_get_booking_token_returns_token():
-    client = make_client()
+def test_get_booking_token_returns_token(client):
     data = {"book_token": {"value": "btoken-xyz"}}
     with patch.object(client.session, "post", return_value=mock_response(data)):
         token = client.get_booking_token("cfg-abc", "2026-03-15", 2)
     assert token == "btoken-xyz"
 
 
-def test_get_booking_token_raises_if_missing():
-    client = make_client()
+def test_get_booking_token_raises_if_missing(client):
     with patch.object(client.session, "post", return_value=mock_response({})):
         with pytest.raises(ValueError, match="book_token"):
             client.get_booking_token("cfg-abc", "2026-03-15", 2)
@@ -182,16 +291,14 @@ def test_get_booking_token_raises_if_missing():
 # book
 # ---------------------------------------------------------------------------
 
-def test_book_returns_confirmation():
-    client = make_client()
+def test_book_returns_confirmation(client):
     confirmation = {"resy_token": "RES-123", "reservation_id": 99}
     with patch.object(client.session, "post", return_value=mock_response(confirmation)):
         result = client.book("btoken-xyz", payment_method_id=42)
     assert result["resy_token"] == "RES-123"
 
 
-def test_book_sends_correct_payload():
-    client = make_client()
+def test_book_sends_correct_payload(client):
     mock_post = MagicMock(return_value=mock_response({"resy_token": "ok"}))
     with patch.object(client.session, "post", mock_post):
         client.book("btoken-xyz", payment_method_id=42)
@@ -200,15 +307,15 @@ def test_book_sends_correct_payload():
     payload = kwargs["data"]
     assert payload["book_token"] == "btoken-xyz"
     assert payload["struct_payment_method"] == '{"id":42}'
+    assert "headers" not in kwargs
 
 
 # ---------------------------------------------------------------------------
 # discover_venue_schedule — venue API path
 # ---------------------------------------------------------------------------
 
-def test_discover_venue_schedule_api_returns_window_and_time():
+def test_discover_venue_schedule_api_returns_window_and_time(client):
     """When the venue API returns booking_window_days and booking_start_time, use them."""
-    client = make_client()
     api_data = {"booking_window_days": 28, "booking_start_time": "09:00"}
     with patch.object(client.session, "get", return_value=mock_response(api_data)):
         window, release_time = client.discover_venue_schedule(venue_id=5286, party_size=2)
@@ -216,9 +323,8 @@ def test_discover_venue_schedule_api_returns_window_and_time():
     assert release_time == "09:00"
 
 
-def test_discover_venue_schedule_api_window_only():
+def test_discover_venue_schedule_api_window_only(client):
     """When only booking_window_days is present, release_time is None."""
-    client = make_client()
     api_data = {"booking_window_days": 30}
     with patch.object(client.session, "get", return_value=mock_response(api_data)):
         window, release_time = client.discover_venue_schedule(5286, 2)
@@ -226,9 +332,8 @@ def test_discover_venue_schedule_api_window_only():
     assert release_time is None
 
 
-def test_discover_venue_schedule_api_nested_availability():
+def test_discover_venue_schedule_api_nested_availability(client):
     """Handles booking_window_days nested inside an 'availability' key."""
-    client = make_client()
     api_data = {"availability": {"booking_window_days": 21, "booking_start_time": "00:00"}}
     with patch.object(client.session, "get", return_value=mock_response(api_data)):
         window, release_time = client.discover_venue_schedule(5286, 2)
@@ -266,9 +371,8 @@ FIND_RESPONSE_WITH_TEMPLATES = {
 }
 
 
-def test_discover_venue_schedule_template_fallback():
+def test_discover_venue_schedule_template_fallback(client):
     """When venue API gives no window, falls through to /4/find template parsing."""
-    client = make_client()
 
     def fake_get(url, **kwargs):
         if "/3/venue" in url:
@@ -282,6 +386,99 @@ def test_discover_venue_schedule_template_fallback():
     assert release_time == "09:00"
 
 
+# ---------------------------------------------------------------------------
+# discover_venue_schedule — caching
+# ---------------------------------------------------------------------------
+
+def test_discover_venue_schedule_cached_in_memory(client):
+    """A second discovery for the same venue makes no HTTP calls."""
+    api_data = {"booking_window_days": 28, "booking_start_time": "09:00"}
+    mock_get = MagicMock(return_value=mock_response(api_data))
+    with patch.object(client.session, "get", mock_get):
+        first = client.discover_venue_schedule(5286, 2)
+        second = client.discover_venue_schedule(5286, 2)
+    assert first == second == (28, "09:00")
+    assert mock_get.call_count == 1
+
+
+def test_discover_venue_schedule_cache_keyed_on_party_size(client):
+    api_data = {"booking_window_days": 28, "booking_start_time": "09:00"}
+    mock_get = MagicMock(return_value=mock_response(api_data))
+    with patch.object(client.session, "get", mock_get):
+        client.discover_venue_schedule(5286, 2)
+        client.discover_venue_schedule(5286, 4)
+    assert mock_get.call_count == 2
+
+
+def test_discover_venue_schedule_disk_cache_survives_restart(tmp_path):
+    cache_file = tmp_path / "venue_schedule.json"
+    api_data = {"booking_window_days": 21, "booking_start_time": "00:00"}
+
+    client = ResyClient("k", "t", schedule_cache_path=cache_file)
+    with patch.object(client.session, "get", return_value=mock_response(api_data)):
+        client.discover_venue_schedule(5286, 2)
+    assert cache_file.exists()
+
+    restarted = ResyClient("k", "t", schedule_cache_path=cache_file)
+    mock_get = MagicMock()
+    with patch.object(restarted.session, "get", mock_get):
+        assert restarted.discover_venue_schedule(5286, 2) == (21, "00:00")
+    mock_get.assert_not_called()
+
+
+def test_discover_venue_schedule_disk_cache_expires(tmp_path):
+    cache_file = tmp_path / "venue_schedule.json"
+    cache_file.write_text(json.dumps({"5286:2": {"window": 21, "release_time": None, "ts": 0}}))
+
+    client = ResyClient("k", "t", schedule_cache_path=cache_file)
+    api_data = {"booking_window_days": 30}
+    with patch.object(client.session, "get", return_value=mock_response(api_data)):
+        assert client.discover_venue_schedule(5286, 2) == (30, None)
+
+
+def test_discover_venue_schedule_concurrent_disk_writes_keep_every_entry(tmp_path):
+    cache_file = tmp_path / "venue_schedule.json"
+    client = ResyClient("k", "t", schedule_cache_path=cache_file)
+    api_data = {"booking_window_days": 21, "booking_start_time": "00:00"}
+    venue_ids = range(1, 17)
+    with patch.object(client.session, "get", return_value=mock_response(api_data)):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(lambda v: client.discover_venue_schedule(v, 2), venue_ids))
+
+    saved = json.loads(cache_file.read_text())
+    assert set(saved) == {f"{v}:2" for v in venue_ids}
+    assert list(tmp_path.iterdir()) == [cache_file]
+
+
+def test_discover_venue_schedule_fallback_not_written_to_disk(tmp_path):
+    """The 30-day default after failed probes must not be cached across restarts."""
+    cache_file = tmp_path / "venue_schedule.json"
+    client = ResyClient("k", "t", schedule_cache_path=cache_file)
+    with patch.object(client.session, "get", side_effect=requests.ConnectionError("down")):
+        assert client.discover_venue_schedule(5286, 2) == (30, None)
+    assert not cache_file.exists()
+
+
+@pytest.mark.parametrize(
+    "contents",
+    [
+        [],
+        {"5286:2": {"release_time": "09:00", "ts": 10**12}},
+        {"5286:2": ["window", 21]},
+        {"5286:2": {"window": "soon", "ts": 10**12}},
+        {"5286:2": {"window": 21, "release_time": 900, "ts": 10**12}},
+        {"5286:2": {"window": 21, "release_time": "9am", "ts": 10**12}},
+    ],
+)
+def test_discover_venue_schedule_malformed_disk_cache_is_a_miss(tmp_path, contents):
+    cache_file = tmp_path / "venue_schedule.json"
+    cache_file.write_text(json.dumps(contents))
+
+    client = ResyClient("k", "t", schedule_cache_path=cache_file)
+    api_data = {"booking_window_days": 28, "booking_start_time": "09:00"}
+    with patch.object(client.session, "get", return_value=mock_response(api_data)):
+        assert client.discover_venue_schedule(5286, 2) == (28, "09:00")
+
 # ---------------------------------------------------------------------------
 # _extract_need_to_know_text
 # ---------------------------------------------------------------------------
@@ -309,6 +506,16 @@ def test_extract_need_to_know_text_skips_missing_body():
     assert text == "Opens at midnight."
 
 
+def test_extract_need_to_know_text_skips_null_levels():
+    find_venue = {
+        "templates": {
+            "1": {"content": None},
+            "2": {"content": {"en-us": {"need_to_know": {"body": "Opens at noon."}}}},
+        }
+    }
+    assert ResyClient._extract_need_to_know_text(find_venue) == "Opens at noon."
+
+
 def test_extract_need_to_know_text_empty_when_no_templates():
     assert ResyClient._extract_need_to_know_text({}) == ""
 
@@ -317,18 +524,15 @@ def test_extract_need_to_know_text_empty_when_no_templates():
 # _probe_find_venue
 # ---------------------------------------------------------------------------
 
-def test_probe_find_venue_returns_first_venue():
-    client = make_client()
+def test_probe_find_venue_returns_first_venue(client):
     with patch.object(client.session, "get", return_value=mock_response(FIND_RESPONSE_WITH_TEMPLATES)):
         result = client._probe_find_venue(venue_id=834, party_size=2)
     assert result is not None
     assert result["venue"]["url_slug"] == "4-charles-prime-rib"
 
 
-def test_probe_find_venue_returns_none_when_no_venues():
-    client = make_client()
-    empty = {"results": {"venues": []}}
-    with patch.object(client.session, "get", return_value=mock_response(empty)):
+def test_probe_find_venue_returns_none_when_no_venues(client):
+    with patch.object(client.session, "get", return_value=mock_response(EMPTY_FIND_RESPONSE)):
         result = client._probe_find_venue(venue_id=834, party_size=2)
     assert result is None
 
@@ -337,24 +541,18 @@ def test_probe_find_venue_returns_none_when_no_venues():
 # discover_venue_schedule — empirical fallback
 # ---------------------------------------------------------------------------
 
-def test_discover_venue_schedule_empirical_fallback():
-    """When API and templates both give nothing, probes /4/find at decreasing windows."""
-    client = make_client()
-
-    session_get_calls = []
+def test_discover_venue_schedule_empirical_fallback(client):
+    """When API and templates both give nothing, returns the largest window with slots."""
+    today = date.today()
 
     def fake_get(url, **kwargs):
-        session_get_calls.append(url)
         if "/3/venue" in url:
             raise Exception("not found")
-        find_calls = [u for u in session_get_calls if "/4/find" in u]
-        # First 3 find calls are the _probe_find_venue probes (return empty → no templates)
-        # 4th call (empirical, 60 days): empty; 5th call (45 days): slots present
-        if len(find_calls) <= 3:
-            return mock_response({"results": {"venues": []}})
-        if len(find_calls) == 4:
-            return mock_response({"results": {"venues": []}})
-        return mock_response(FIND_SLOTS_RESPONSE)
+        days_out = (date.fromisoformat(kwargs["params"]["day"]) - today).days
+        # Slots exist up to 45 days out (no templates, so step 2 finds nothing)
+        if days_out <= 45:
+            return mock_response(FIND_SLOTS_RESPONSE)
+        return mock_response(EMPTY_FIND_RESPONSE)
 
     with patch.object(client.session, "get", side_effect=fake_get):
         window, release_time = client.discover_venue_schedule(5286, 2)
@@ -363,14 +561,13 @@ def test_discover_venue_schedule_empirical_fallback():
     assert release_time is None
 
 
-def test_discover_venue_schedule_all_empty_defaults_to_30():
+def test_discover_venue_schedule_all_empty_defaults_to_30(client):
     """When nothing is found anywhere, defaults to 30 days and None release time."""
-    client = make_client()
 
     def fake_get(url, **kwargs):
         if "/3/venue" in url:
             raise Exception("API unavailable")
-        return mock_response({"results": {"venues": []}})
+        return mock_response(EMPTY_FIND_RESPONSE)
 
     with patch.object(client.session, "get", side_effect=fake_get):
         window, release_time = client.discover_venue_schedule(5286, 2)
@@ -379,6 +576,24 @@ def test_discover_venue_schedule_all_empty_defaults_to_30():
     assert release_time is None
 
 
+def test_discover_venue_schedule_skips_windows_already_probed_empty(client):
+    """Days-out that the template probe found empty aren't re-queried empirically."""
+    today = date.today()
+    find_days = []
+
+    def fake_get(url, **kwargs):
+        if "/3/venue" in url:
+            raise Exception("API unavailable")
+        find_days.append((date.fromisoformat(kwargs["params"]["day"]) - today).days)
+        return mock_response(EMPTY_FIND_RESPONSE)
+
+    with patch.object(client.session, "get", side_effect=fake_get):
+        client.discover_venue_schedule(5286, 2)
+
+    # 7/14/30 from the probe, then only the remaining empirical windows
+    assert sorted(find_days) == [7, 14, 21, 28, 30, 45, 60]
+
+
 # ---------------------------------------------------------------------------
 # _parse_window_days / _parse_release_time
 # ---------------------------------------------------------------------------
@@ -391,6 +606,30 @@ def test_parse_window_days_ahead():
     assert ResyClient._parse_window_days("books up to 28 days ahead") == 28
 
 
+def test_parse_window_days_up_to():
+    assert ResyClient._parse_window_days("tables available up to 21 days out") == 21
+
+
+def test_parse_window_days_books():
+    assert ResyClient._parse_window_days("the restaurant books 14 days out") == 14
+
+
+def test_parse_window_days_mixed_case():
+    assert ResyClient._parse_window_days("Reservations Open 30 Days In Advance") == 30
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("We book 14 days out. Reservations open 30 days in advance.", 30),
+        ("Book up to 60 days for groups; tables open 30 days in advance", 30),
+        ("Seats release 7 days before; bookings open 14 days ahead", 14),
+    ],
+)
+def test_parse_window_days_prefers_phrasing_over_position(text, expected):
+    assert ResyClient._parse_window_days(text) == expected
+
+
 def test_parse_window_days_none():
     assert ResyClient._parse_window_days("no relevant text here") is None
 
@@ -415,10 +654,26 @@ def test_parse_release_time_pm():
     assert ResyClient._parse_release_time("releases at 1:00pm") == "13:00"
 
 
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("Opens at 9am for walk-ins; tables release at midnight", "00:00"),
+        ("Bar opens at 5pm. Reservations available at noon", "12:00"),
+        ("Patio opens at 11am; dining room drops at 9:30am", "11:00"),
+    ],
+)
+def test_parse_release_time_prefers_midnight_then_noon(text, expected):
+    assert ResyClient._parse_release_time(text) == expected
+
+
 def test_parse_release_time_none():
     assert ResyClient._parse_release_time("no time mentioned here") is None
 
 
+def test_parse_release_time_title_case_midnight():
+    assert ResyClient._parse_release_time("Reservations open at Midnight ET") == "00:00"
+
+
 def test_parse_release_time_uppercase_am():
     assert ResyClient._parse_release_time("with each new date becoming available at 9 AM.") == "09:00"
 
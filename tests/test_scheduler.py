@@ -1,74 +1,175 @@
 """Tests for bot/scheduler.py — slot selection, candidate date generation, booking logic."""
 from __future__ import annotations
 
-from datetime import date, datetime, timedelta
+import functools
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
 from unittest.mock import MagicMock, call, patch
+from zoneinfo import ZoneInfo
 
 import pytest
 
 from bot.config import AppConfig, Target
 from bot.resy_client import Slot
-from bot.scheduler import Scheduler
+from bot.scheduler import (
+    MAX_CONCURRENT_REQUESTS,
+    PREWARM_LEAD_SECONDS,
+    SNIPE_CONCURRENCY,
+    SNIPE_EXECUTOR,
+    SNIPE_INITIAL_DELAY,
+    SNIPE_MAX_DELAY,
+    Scheduler,
+    _next_snipe_delay,
+)
 
 
 # ---------------------------------------------------------------------------
 # Fixtures
 # ---------------------------------------------------------------------------
 
+TARGET_DEFAULTS = dict(
+    venue_id=5286,
+    venue_name="Carbone",
+    start_date="2026-03-01",
+    end_date="2026-04-30",
+    party_size=2,
+    days_of_week=["Tuesday", "Thursday"],
+    time_center="19:00",
+    time_radius_minutes=30,
+    venue_timezone="America/New_York",
+    poll_interval_seconds=30,
+)
+# Target is frozen, so tests that don't override anything can share one
+# validated instance
+DEFAULT_TARGET = Target(**TARGET_DEFAULTS)
+DEFAULT_CONFIG = AppConfig(targets=[DEFAULT_TARGET])
+
+
 def make_target(**overrides) -> Target:
-    defaults = dict(
-        venue_id=5286,
-        venue_name="Carbone",
-        start_date="2026-03-01",
-        end_date="2026-04-30",
-        party_size=2,
-        days_of_week=["Tuesday", "Thursday"],
-        time_center="19:00",
-        time_radius_minutes=30,
-        venue_timezone="America/New_York",
-        poll_interval_seconds=30,
+    if not overrides:
+        return DEFAULT_TARGET
+    return Target(**{**TARGET_DEFAULTS, **overrides})
+
+
+ALL_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def make_target_spanning(first: date, last: date, **overrides) -> Target:
+    """Target whose candidate dates are every day from first to last inclusive."""
+    return make_target(
+        start_date=first.isoformat(),
+        end_date=last.isoformat(),
+        days_of_week=ALL_DAYS,
+        **overrides,
     )
-    return Target(**{**defaults, **overrides})
 
 
-def make_scheduler(targets=None, client=None) -> Scheduler:
-    if targets is None:
-        targets = [make_target()]
-    cfg = AppConfig(targets=targets)
+class FakeClient:
+    """Plain stand-in for the ResyClient calls made while booking."""
+
+    def __init__(
+        self,
+        slots: list[Slot],
+        token: str = "btoken",
+        token_error: Exception | None = None,
+        book_error: Exception | None = None,
+    ) -> None:
+        self.slots = slots
+        self.token = token
+        self.token_error = token_error
+        self.book_error = book_error
+        self.booked: list[tuple[str, int]] = []
+
+    def find_slots(self, venue_id: int, date_str: str, party_size: int) -> list[Slot]:
+        return self.slots
+
+    def get_booking_token(self, config_id: str, date_str: str, party_size: int) -> str:
+        if self.token_error is not None:
+            raise self.token_error
+        return self.token
+
+    def book(self, book_token: str, payment_method_id: int) -> dict:
+        if self.book_error is not None:
+            raise self.book_error
+        self.booked.append((book_token, payment_method_id))
+        return {"resy_token": "RES-1"}
+
+
+class FakeAPS:
+    """Stands in for BackgroundScheduler, recording the calls Scheduler makes."""
+
+    def __init__(self) -> None:
+        self.added: list[dict] = []    # add_job kwargs (plus "func"), in call order
+        self.removed: list[str] = []
+        self.removed_all = 0
+        self.running = False
+
+    def add_job(self, func, **kwargs) -> None:
+        self.added.append({"func": func, **kwargs})
+
+    def remove_job(self, job_id: str) -> None:
+        self.removed.append(job_id)
+
+    def remove_all_jobs(self) -> None:
+        self.removed_all += 1
+
+    def get_jobs(self) -> list[dict]:
+        return list(self.added)
+
+    def start(self) -> None:
+        self.running = True
+
+    def shutdown(self, wait: bool = True) -> None:
+        self.running = False
+
+
+def make_scheduler(
+    targets=None,
+    client=None,
+    config: AppConfig | None = None,
+    clock=date.today,
+    now=datetime.now,
+) -> Scheduler:
+    if config is None:
+        config = AppConfig(targets=targets) if targets is not None else DEFAULT_CONFIG
     client = client or MagicMock()
-    sched = Scheduler(client=client, config=cfg, payment_method_id=42)
+    sched = Scheduler(
+        client=client, config=config, payment_method_id=42, clock=clock, now=now
+    )
     # Prevent the real APScheduler from starting
-    sched._scheduler = MagicMock()
+    sched._scheduler = FakeAPS()
     return sched
 
 
+@functools.lru_cache(maxsize=None)
 def make_slot(hhmm: str, date_str: str = "2026-03-15", config_id: str = "cfg-1") -> Slot:
-    hour, minute = hhmm.split(":")
-    year, month, day = date_str.split("-")
-    return Slot(
-        config_id=config_id,
-        start_time=datetime(int(year), int(month), int(day), int(hour), int(minute)),
-    )
+    # Slot is frozen, so one instance per argument tuple can be shared between tests
+    return Slot(config_id=config_id, start_time=datetime.fromisoformat(f"{date_str}T{hhmm}"))
+
+
+@pytest.fixture(scope="module")
+def default_sched() -> Scheduler:
+    """A scheduler for tests that only call target-in, value-out helpers."""
+    return make_scheduler(config=DEFAULT_CONFIG)
 
 
 # ---------------------------------------------------------------------------
 # _generate_candidate_dates
 # ---------------------------------------------------------------------------
 
-def test_generate_candidate_dates_correct_days():
+# Tuesdays and Thursdays of March 2026, shared by the tests below
+MARCH_TARGET = make_target(start_date="2026-03-01", end_date="2026-03-31")
+
+
+def test_generate_candidate_dates_correct_days(default_sched):
     """Only Tuesdays and Thursdays should be returned."""
-    target = make_target(
-        start_date="2026-03-01",
-        end_date="2026-03-31",
-        days_of_week=["Tuesday", "Thursday"],
-    )
-    sched = make_scheduler(targets=[target])
-    candidates = sched._generate_candidate_dates(target)
+    candidates = default_sched._generate_candidate_dates(MARCH_TARGET)
     for d in candidates:
         assert d.weekday() in (1, 3)  # Tuesday=1, Thursday=3
 
 
-def test_generate_candidate_dates_boundary_dates_included():
+def test_generate_candidate_dates_boundary_dates_included(default_sched):
     """start_date and end_date are included if they match days_of_week."""
     # 2026-03-03 is a Tuesday; 2026-03-05 is a Thursday
     target = make_target(
@@ -76,42 +177,33 @@ def test_generate_candidate_dates_boundary_dates_included():
         end_date="2026-03-05",
         days_of_week=["Tuesday", "Thursday"],
     )
-    sched = make_scheduler(targets=[target])
-    candidates = sched._generate_candidate_dates(target)
+    candidates = default_sched._generate_candidate_dates(target)
     assert date(2026, 3, 3) in candidates
     assert date(2026, 3, 5) in candidates
 
 
-def test_generate_candidate_dates_count():
+def test_generate_candidate_dates_count(default_sched):
     """March 2026 has 5 Tuesdays (3,10,17,24,31) and 4 Thursdays (5,12,19,26) = 9 total."""
-    target = make_target(
-        start_date="2026-03-01",
-        end_date="2026-03-31",
-        days_of_week=["Tuesday", "Thursday"],
-    )
-    sched = make_scheduler(targets=[target])
-    candidates = sched._generate_candidate_dates(target)
+    candidates = default_sched._generate_candidate_dates(MARCH_TARGET)
     assert len(candidates) == 9
 
 
-def test_generate_candidate_dates_empty_when_no_match():
+def test_generate_candidate_dates_empty_when_no_match(default_sched):
     target = make_target(
         start_date="2026-03-02",  # Monday
         end_date="2026-03-02",
         days_of_week=["Tuesday"],
     )
-    sched = make_scheduler(targets=[target])
-    assert sched._generate_candidate_dates(target) == []
+    assert default_sched._generate_candidate_dates(target) == []
 
 
-def test_generate_candidate_dates_sorted():
+def test_generate_candidate_dates_sorted(default_sched):
     target = make_target(
         start_date="2026-03-01",
         end_date="2026-03-31",
         days_of_week=["Thursday", "Tuesday"],  # reversed order — output still sorted
     )
-    sched = make_scheduler(targets=[target])
-    candidates = sched._generate_candidate_dates(target)
+    candidates = default_sched._generate_candidate_dates(target)
     assert candidates == sorted(candidates)
 
 
@@ -119,52 +211,28 @@ def test_generate_candidate_dates_sorted():
 # _pick_preferred_slot
 # ---------------------------------------------------------------------------
 
-def test_pick_preferred_slot_exact_center():
-    sched = make_scheduler()
-    slots = [make_slot("19:00")]
-    result = sched._pick_preferred_slot(slots, "19:00", 30)
-    assert result is not None
-    assert result.config_id == "cfg-1"
-
-
-def test_pick_preferred_slot_within_window():
-    sched = make_scheduler()
-    slots = [make_slot("19:20", config_id="cfg-a")]
-    result = sched._pick_preferred_slot(slots, "19:00", 30)
-    assert result is not None
-    assert result.config_id == "cfg-a"
-
-
-def test_pick_preferred_slot_outside_window_returns_none():
-    sched = make_scheduler()
-    slots = [make_slot("21:00")]
-    result = sched._pick_preferred_slot(slots, "19:00", 30)
-    assert result is None
-
-
-def test_pick_preferred_slot_closest_to_center_wins():
-    sched = make_scheduler()
-    # 18:45 is 15 min away; 19:25 is 25 min away — 18:45 should win
-    slots = [
-        make_slot("19:25", config_id="far"),
-        make_slot("18:45", config_id="close"),
-    ]
-    result = sched._pick_preferred_slot(slots, "19:00", 30)
-    assert result is not None
-    assert result.config_id == "close"
-
-
-def test_pick_preferred_slot_empty_list():
-    sched = make_scheduler()
-    assert sched._pick_preferred_slot([], "19:00", 30) is None
-
-
-def test_pick_preferred_slot_boundary_included():
-    """A slot exactly radius_minutes away should still be returned."""
-    sched = make_scheduler()
-    slots = [make_slot("19:30")]  # exactly 30 min from 19:00
-    result = sched._pick_preferred_slot(slots, "19:00", 30)
-    assert result is not None
+@pytest.mark.parametrize(
+    "slots, expected",
+    [
+        pytest.param([("19:00", "cfg-1")], "cfg-1", id="exact_center"),
+        pytest.param([("19:20", "cfg-a")], "cfg-a", id="within_window"),
+        pytest.param([("21:00", "cfg-1")], None, id="outside_window_returns_none"),
+        # 18:45 is 15 min away; 19:25 is 25 min away — 18:45 should win
+        pytest.param(
+            [("19:25", "far"), ("18:45", "close")], "close", id="closest_to_center_wins"
+        ),
+        pytest.param(
+            [("18:45", "early"), ("19:15", "late")], "early", id="first_of_equal_distance_wins"
+        ),
+        pytest.param([], None, id="empty_list"),
+        # A slot exactly radius_minutes away should still be returned
+        pytest.param([("19:30", "edge")], "edge", id="boundary_included"),
+    ],
+)
+def test_pick_preferred_slot(slots, expected):
+    candidates = [make_slot(hhmm, config_id=config_id) for hhmm, config_id in slots]
+    result = Scheduler._pick_preferred_slot(candidates, 19 * 60, 30)
+    assert (result.config_id if result is not None else None) == expected
 
 
 # ---------------------------------------------------------------------------
@@ -215,28 +283,16 @@ def test_attempt_booking_find_slots_error():
     assert sched._booked is False
 
 
-def test_attempt_booking_book_error():
-    client = MagicMock()
-    client.find_slots.return_value = [make_slot("19:00")]
-    client.get_booking_token.return_value = "btoken"
-    client.book.side_effect = Exception("payment failed")
-
-    target = make_target(time_center="19:00")
-    sched = make_scheduler(targets=[target], client=client)
-
-    result = sched._attempt_booking(target, "2026-03-15")
-
-    assert result is False
-    assert sched._booked is False
-
-
-def test_attempt_booking_book_error_leaves_unbooked():
-    """A book() error must leave _booked as False."""
-    client = MagicMock()
-    client.find_slots.return_value = [make_slot("19:00")]
-    client.get_booking_token.return_value = "btoken"
-    client.book.side_effect = Exception("payment failed again")
-
+@pytest.mark.parametrize(
+    "token_error, book_error",
+    [
+        pytest.param(None, Exception("payment failed"), id="book_fails"),
+        pytest.param(Exception("details expired"), None, id="token_fails"),
+    ],
+)
+def test_attempt_booking_error_leaves_unbooked(token_error, book_error):
+    """An error anywhere in the details -> book exchange must leave _booked False."""
+    client = FakeClient([make_slot("19:00")], token_error=token_error, book_error=book_error)
     target = make_target(time_center="19:00")
     sched = make_scheduler(targets=[target], client=client)
 
@@ -244,6 +300,7 @@ def test_attempt_booking_book_error_leaves_unbooked():
 
     assert result is False
     assert sched._booked is False
+    assert client.booked == []
 
 
 def test_attempt_booking_cancels_all_jobs_on_success():
@@ -256,16 +313,9 @@ def test_attempt_booking_cancels_all_jobs_on_success():
     target = make_target(time_center="19:00")
     sched = make_scheduler(targets=[target], client=client)
 
-    # Simulate two jobs in the scheduler
-    fake_job_a = MagicMock()
-    fake_job_a.id = "poll_5286"
-    fake_job_b = MagicMock()
-    fake_job_b.id = "snipe_5286_2026-03-17"
-    sched._scheduler.get_jobs.return_value = [fake_job_a, fake_job_b]
-
     sched._attempt_booking(target, "2026-03-15")
 
-    assert sched._scheduler.remove_job.call_count == 2
+    assert sched._scheduler.removed_all == 1
 
 
 # ---------------------------------------------------------------------------
@@ -278,7 +328,7 @@ def test_poll_job_skips_if_already_booked():
     sched = make_scheduler(targets=[target], client=client)
     sched._booked = True
 
-    sched._poll_job(target, [date(2026, 3, 17)], 30)
+    sched._poll_job(0, 30)
 
     client.find_slots.assert_not_called()
 
@@ -286,23 +336,50 @@ def test_poll_job_skips_if_already_booked():
 def test_poll_job_skips_dates_outside_window():
     """Dates more than window_days out should not trigger a booking attempt."""
     client = MagicMock()
-    target = make_target()
+    future_date = date.today() + timedelta(days=60)  # well outside window of 30
+    target = make_target_spanning(future_date, future_date)
     sched = make_scheduler(targets=[target], client=client)
 
-    future_date = date.today() + timedelta(days=60)  # well outside window of 30
-    sched._poll_job(target, [future_date], 30)
+    sched._poll_job(0, 30)
 
     client.find_slots.assert_not_called()
 
 
-def test_poll_job_attempts_dates_within_window():
+def test_poll_job_skips_past_dates():
+    client = MagicMock()
+    yesterday = date.today() - timedelta(days=1)
+    target = make_target_spanning(yesterday - timedelta(days=7), yesterday)
+    sched = make_scheduler(targets=[target], client=client)
+
+    sched._poll_job(0, 30)
+
+    client.find_slots.assert_not_called()
+
+
+def test_poll_job_window_edges_inclusive():
+    """Both today and today + window_days are in the window; the day after is not."""
     client = MagicMock()
     client.find_slots.return_value = []
-    target = make_target()
+    today = date.today()
+    target = make_target_spanning(today - timedelta(days=1), today + timedelta(days=11))
     sched = make_scheduler(targets=[target], client=client)
 
+    sched._poll_job(0, 10)
+
+    queried = sorted(c.args[1] for c in client.find_slots.call_args_list)
+    assert queried[0] == today.isoformat()
+    assert queried[-1] == (today + timedelta(days=10)).isoformat()
+    assert len(queried) == 11
+
+
+def test_poll_job_attempts_dates_within_window():
+    client = MagicMock()
+    client.find_slots.return_value = []
     near_date = date.today() + timedelta(days=5)
-    sched._poll_job(target, [near_date], 30)
+    target = make_target_spanning(near_date, near_date)
+    sched = make_scheduler(targets=[target], client=client)
+
+    sched._poll_job(0, 30)
 
     client.find_slots.assert_called_once_with(target.venue_id, near_date.isoformat(), target.party_size)
 
@@ -314,24 +391,302 @@ def test_poll_job_stops_after_successful_booking():
     client.get_booking_token.return_value = "tok"
     client.book.return_value = {"resy_token": "X"}
 
+    today = date.today()
+    target = make_target_spanning(today, today + timedelta(days=1), time_center="19:00")
+    sched = make_scheduler(targets=[target], client=client)
+
+    sched._poll_job(0, 30)
+
+    # Both dates are looked up concurrently, but only one booking is made
+    assert client.book.call_count == 1
+
+
+# ---------------------------------------------------------------------------
+# _schedule_snipe
+# ---------------------------------------------------------------------------
+
+def test_schedule_snipe_converts_local_release_time_to_utc():
+    """09:00 in New York on 2026-03-10 (EDT, UTC-4) fires at 13:00 UTC."""
+    target = make_target(venue_timezone="America/New_York")
+    sched = make_scheduler(targets=[target])
+
+    sched._schedule_snipe(0, date(2026, 4, 9), date(2026, 3, 10), 9, 0)
+
+    kwargs = sched._scheduler.added[-1]
+    fire_time = kwargs["trigger"].get_next_fire_time(
+        None, datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+    assert fire_time == datetime(2026, 3, 10, 13, 0, tzinfo=timezone.utc)
+
+
+def test_schedule_snipe_passes_index_and_ordinal_args():
+    target = make_target()
+    sched = make_scheduler(targets=[make_target(venue_id=1), target])
+
+    sched._schedule_snipe(1, date(2026, 4, 9), date(2026, 3, 10), 9, 0)
+
+    kwargs = sched._scheduler.added[-1]
+    assert kwargs["args"] == [1, date(2026, 4, 9).toordinal()]
+    assert kwargs["id"] == f"snipe_{target.venue_id}_2026-04-09"
+
+
+def test_schedule_snipe_registers_prewarm_before_release():
+    target = make_target(venue_timezone="America/New_York")
+    sched = make_scheduler(targets=[target])
+
+    sched._schedule_snipe(0, date(2026, 4, 9), date(2026, 3, 10), 9, 0)
+
+    jobs = {job["id"]: job for job in sched._scheduler.added}
+    prewarm = jobs[f"prewarm_{target.venue_id}_2026-04-09"]
+    fire_time = prewarm["trigger"].get_next_fire_time(
+        None, datetime(2026, 1, 1, tzinfo=timezone.utc)
+    )
+    assert fire_time == datetime(2026, 3, 10, 13, 0, tzinfo=timezone.utc) - timedelta(
+        seconds=PREWARM_LEAD_SECONDS
+    )
+    assert prewarm["args"] == [0]
+
+
+def test_prewarm_job_swallows_errors():
+    client = MagicMock()
+    client.warm_up.side_effect = Exception("connection refused")
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+
+    sched._prewarm_job(0)
+
+    client.warm_up.assert_called_once_with(target.venue_id)
+
+
+# ---------------------------------------------------------------------------
+# _snipe_job
+# ---------------------------------------------------------------------------
+
+def test_snipe_job_skipped_after_shutdown():
+    """A snipe that fires after shutdown() sends no requests."""
+    client = MagicMock()
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+    sched._stop_event.set()
+
+    sched._snipe_job(0, date(2026, 3, 15).toordinal())
+
+    client.find_slots.assert_not_called()
+
+
+def test_snipe_job_stops_when_stop_event_set():
+    """A sibling booking (or shutdown) ends an in-flight burst without sleeping it out."""
+    client = MagicMock()
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+
+    def find_slots_then_stop(*args):
+        sched._stop_event.set()
+        return []
+
+    client.find_slots.side_effect = find_slots_then_stop
+
+    started = time.monotonic()
+    sched._snipe_job(0, date(2026, 3, 15).toordinal())
+
+    assert client.find_slots.call_count == 1
+    assert time.monotonic() - started < SNIPE_MAX_DELAY
+
+
+def test_next_snipe_delay_grows_geometrically():
+    delay = SNIPE_INITIAL_DELAY
+    delays = []
+    for _ in range(5):
+        delay = _next_snipe_delay(delay)
+        delays.append(delay)
+    assert delays == sorted(delays)
+    assert delays[-1] > 5 * SNIPE_INITIAL_DELAY
+
+
+def test_next_snipe_delay_clamped():
+    assert _next_snipe_delay(SNIPE_MAX_DELAY) == SNIPE_MAX_DELAY
+    assert _next_snipe_delay(0.0) == SNIPE_INITIAL_DELAY
+
+
+def test_snipe_job_never_waits_past_deadline():
+    client = MagicMock()
+    client.find_slots.return_value = []
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+    sched._stop_event = MagicMock()
+    sched._stop_event.is_set.return_value = False
+    sched._stop_event.wait.return_value = True
+
+    with patch("bot.scheduler.SNIPE_WINDOW_SECONDS", 0.01):
+        sched._snipe_job(0, date(2026, 3, 15).toordinal())
+
+    (timeout,), _ = sched._stop_event.wait.call_args
+    assert timeout <= 0.01
+
+
+def test_snipe_job_pipelines_attempts():
+    """Attempts overlap: a new one starts while earlier ones are still in flight."""
+    release = threading.Event()
+    client = MagicMock()
+
+    def slow_find(*args):
+        release.wait(1)
+        return []
+
+    client.find_slots.side_effect = slow_find
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+
+    with patch("bot.scheduler.SNIPE_WINDOW_SECONDS", 0.8):
+        runner = threading.Thread(target=sched._snipe_job, args=(0, date(2026, 3, 15).toordinal()))
+        runner.start()
+        give_up = time.monotonic() + 0.6
+        while client.find_slots.call_count < SNIPE_CONCURRENCY and time.monotonic() < give_up:
+            time.sleep(0.01)
+        in_flight = client.find_slots.call_count
+        release.set()
+        runner.join()
+
+    # All attempts were blocked, so the cap — not completion — limited them
+    assert in_flight == SNIPE_CONCURRENCY
+
+
+def test_book_slot_refuses_second_booking():
+    client = MagicMock()
+    client.get_booking_token.return_value = "btoken"
+    client.book.return_value = {"resy_token": "RES-1"}
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+
+    assert sched._book_slot(target, "2026-03-15", make_slot("19:00")) is True
+    assert sched._book_slot(target, "2026-03-17", make_slot("19:00")) is False
+    client.book.assert_called_once()
+
+
+def test_successful_booking_sets_stop_event():
+    client = MagicMock()
+    client.find_slots.return_value = [make_slot("19:00")]
+    client.get_booking_token.return_value = "btoken"
+    client.book.return_value = {"resy_token": "RES-1"}
     target = make_target(time_center="19:00")
     sched = make_scheduler(targets=[target], client=client)
-    sched._scheduler.get_jobs.return_value = []
 
+    sched._attempt_booking(target, "2026-03-15")
+
+    assert sched._stop_event.is_set()
+
+
+def test_shutdown_sets_stop_event():
+    sched = make_scheduler()
+    sched.shutdown()
+    assert sched._stop_event.is_set()
+
+
+def test_poll_job_queries_all_in_window_dates():
+    client = MagicMock()
+    client.find_slots.return_value = []
     today = date.today()
-    candidate_dates = [today, today + timedelta(days=7)]
+    target = make_target_spanning(today + timedelta(days=1), today + timedelta(days=3))
+    sched = make_scheduler(targets=[target], client=client)
 
-    sched._poll_job(target, candidate_dates, 30)
+    sched._poll_job(0, 30)
 
-    # Only the first date should have been queried
-    assert client.find_slots.call_count == 1
+    queried = sorted(c.args[1] for c in client.find_slots.call_args_list)
+    assert queried == [d.isoformat() for d in target.candidate_dates]
+    assert len(queried) == 3
+
+
+def test_poll_jobs_share_persistent_lookup_pool():
+    threads = set()
+    client = MagicMock()
+
+    def find(*args):
+        threads.add(threading.current_thread().name)
+        return []
+
+    client.find_slots.side_effect = find
+    today = date.today()
+    targets = [
+        make_target_spanning(today, today + timedelta(days=2), venue_id=1),
+        make_target_spanning(today, today + timedelta(days=2), venue_id=2),
+    ]
+    sched = make_scheduler(targets=targets, client=client)
+
+    sched._poll_job(0, 30)
+    sched._poll_job(1, 30)
+
+    assert client.find_slots.call_count == 6
+    assert all(name.startswith("lookup") for name in threads)
+    assert len(threads) <= MAX_CONCURRENT_REQUESTS
+
+
+def test_shutdown_closes_lookup_pool():
+    sched = make_scheduler()
+    sched.shutdown()
+    with pytest.raises(RuntimeError):
+        sched._lookup_pool.submit(lambda: None)
+
+
+def test_poll_job_skipped_after_shutdown():
+    client = MagicMock()
+    today = date.today()
+    target = make_target_spanning(today, today + timedelta(days=2))
+    sched = make_scheduler(targets=[target], client=client)
+    sched.shutdown()
+
+    sched._poll_job(0, 30)
+
+    client.find_slots.assert_not_called()
+
+
+def test_poll_job_tolerates_shutdown_mid_tick():
+    """Lookups cancelled by shutdown() are skipped, not read for a result."""
+    today = date.today()
+    target = make_target_spanning(today, today + timedelta(days=MAX_CONCURRENT_REQUESTS * 3))
+    client = MagicMock()
+    sched = make_scheduler(targets=[target], client=client)
+
+    def find_then_shut_down(*args):
+        sched.shutdown()
+        return []
+
+    client.find_slots.side_effect = find_then_shut_down
+
+    sched._poll_job(0, MAX_CONCURRENT_REQUESTS * 3)
+
+    assert client.find_slots.call_count < len(target.candidate_dates)
+
+
+def test_poll_job_books_remaining_date_after_failed_booking():
+    """If booking one date fails, other dates with preferred slots are still tried."""
+    client = MagicMock()
+    client.find_slots.return_value = [make_slot("19:00")]
+    client.get_booking_token.return_value = "tok"
+    client.book.side_effect = [Exception("slot taken"), {"resy_token": "X"}]
+    today = date.today()
+    target = make_target_spanning(
+        today + timedelta(days=1), today + timedelta(days=2), time_center="19:00"
+    )
+    sched = make_scheduler(targets=[target], client=client)
+
+    sched._poll_job(0, 30)
+
+    assert client.book.call_count == 2
+    assert sched._booked is True
 
 
 # ---------------------------------------------------------------------------
 # _discovery_job
 # ---------------------------------------------------------------------------
 
-def test_discovery_job_schedules_snipes_when_date_appears_on_calendar():
+@pytest.fixture
+def fast_confirm():
+    """Confirm discovery flips without waiting between re-probes."""
+    with patch("bot.scheduler.DISCOVERY_CONFIRM_DELAYS", (0, 0, 0)):
+        yield
+
+
+def test_discovery_job_schedules_snipes_when_date_appears_on_calendar(fast_confirm):
     """When a date first appears on the calendar, snipe jobs should be scheduled."""
     client = MagicMock()
     client.is_date_on_calendar.return_value = True  # date is now on calendar
@@ -342,20 +697,99 @@ def test_discovery_job_schedules_snipes_when_date_appears_on_calendar():
         days_of_week=["Tuesday"],
         venue_timezone="America/New_York",
     )
-    sched = make_scheduler(targets=[target], client=client)
+    # Pin today far in the past so release days (candidate - 30d) are in the future
+    sched = make_scheduler(targets=[target], client=client, clock=lambda: date(2025, 1, 1))
     sched._discovery_prev_on_calendar[target.venue_id] = False  # was not on calendar before
 
-    candidate_dates = [date(2026, 3, 3), date(2026, 3, 10)]
-    # Mock today far in the past so release days (candidate - 30d) are in the future
-    fake_today = date(2025, 1, 1)
-    window_days = 30
-
-    with patch("bot.scheduler.date") as mock_date:
-        mock_date.today.return_value = fake_today
-        sched._discovery_job(target, window_days, candidate_dates)
+    sched._discovery_job(0, 30)
 
     # Snipe jobs should have been scheduled for future release days
-    assert sched._scheduler.add_job.called
+    assert sched._scheduler.added
+
+
+def test_discovery_job_removes_both_discovery_jobs_on_detection(fast_confirm):
+    client = MagicMock()
+    client.is_date_on_calendar.return_value = True
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+    sched._discovery_prev_on_calendar[target.venue_id] = False
+
+    sched._discovery_job(0, 30)
+
+    removed = sched._scheduler.removed
+    assert f"discover_{target.venue_id}" in removed
+    assert f"discover_dense_{target.venue_id}" in removed
+
+
+def test_discovery_job_requires_confirmation_before_scheduling(fast_confirm):
+    """A flip that doesn't survive a re-probe schedules nothing and is retried later."""
+    client = MagicMock()
+    client.is_date_on_calendar.side_effect = [True, False, False, False]
+    target = make_target()
+    sched = make_scheduler(targets=[target], client=client)
+    sched._discovery_prev_on_calendar[target.venue_id] = False
+
+    sched._discovery_job(0, 30)
+
+    assert client.is_date_on_calendar.call_count == 4
+    assert sched._scheduler.added == []
+    assert sched._scheduler.removed == []
+    assert sched._discovery_prev_on_calendar[target.venue_id] is False
+    assert target.venue_id not in sched._discovery_detected
+
+
+def test_overlapping_discovery_jobs_schedule_snipes_once(fast_confirm):
+    """Runs already in flight when the flip is acted on must not act on it again."""
+    client = MagicMock()
+    target = make_target(
+        start_date="2026-03-01", end_date="2026-03-31", days_of_week=["Tuesday"]
+    )
+    sched = make_scheduler(targets=[target], client=client, clock=lambda: date(2025, 1, 1))
+    sched._discovery_prev_on_calendar[target.venue_id] = False
+
+    # The first run detects the release; overlapping hourly/dense runs that
+    # finish afterwards see a flaky miss and then the date again
+    for on_calendar in (True, False, True):
+        client.is_date_on_calendar.return_value = on_calendar
+        sched._discovery_job(0, 30)
+
+    job_ids = [job["id"] for job in sched._scheduler.added]
+    assert job_ids
+    assert len(job_ids) == len(set(job_ids))
+
+
+@pytest.mark.parametrize(
+    "seen_at, expected_hour",
+    [
+        ((8, 59, 10), 9),   # dense probe just ahead of the hour rounds up
+        ((9, 0, 30), 9),    # release seen just after the hour stays in it
+        ((9, 1, 55), 9),
+        ((9, 40, 0), 9),    # never pushed into the next hour once past :59
+    ],
+)
+def test_discovery_job_infers_release_hour(fast_confirm, seen_at, expected_hour):
+    client = MagicMock()
+    client.is_date_on_calendar.return_value = True
+    target = make_target(
+        start_date="2026-03-01", end_date="2026-03-31", days_of_week=["Tuesday"]
+    )
+    sched = make_scheduler(
+        targets=[target],
+        client=client,
+        clock=lambda: date(2025, 1, 1),
+        now=lambda tz: datetime(2025, 1, 1, *seen_at, tzinfo=tz),
+    )
+    sched._discovery_prev_on_calendar[target.venue_id] = False
+
+    sched._discovery_job(0, 30)
+
+    tz = ZoneInfo(target.venue_timezone)
+    snipe_hours = {
+        job["trigger"].run_date.astimezone(tz).hour
+        for job in sched._scheduler.added
+        if job["id"].startswith("snipe_")
+    }
+    assert snipe_hours == {expected_hour}
 
 
 def test_discovery_job_no_action_when_date_already_on_calendar():
@@ -367,10 +801,9 @@ def test_discovery_job_no_action_when_date_already_on_calendar():
     sched = make_scheduler(targets=[target], client=client)
     sched._discovery_prev_on_calendar[target.venue_id] = True  # already on calendar
 
-    candidate_dates = [date(2026, 3, 3)]
-    sched._discovery_job(target, 30, candidate_dates)
+    sched._discovery_job(0, 30)
 
-    sched._scheduler.add_job.assert_not_called()
+    assert sched._scheduler.added == []
 
 
 def test_discovery_job_no_action_when_date_not_on_calendar():
@@ -382,10 +815,9 @@ def test_discovery_job_no_action_when_date_not_on_calendar():
     sched = make_scheduler(targets=[target], client=client)
     sched._discovery_prev_on_calendar[target.venue_id] = False
 
-    candidate_dates = [date(2026, 3, 3)]
-    sched._discovery_job(target, 30, candidate_dates)
+    sched._discovery_job(0, 30)
 
-    sched._scheduler.add_job.assert_not_called()
+    assert sched._scheduler.added == []
 
 
 def test_discovery_job_skips_if_booked():
@@ -394,7 +826,7 @@ def test_discovery_job_skips_if_booked():
     sched = make_scheduler(targets=[target], client=client)
     sched._booked = True
 
-    sched._discovery_job(target, 30, [date(2026, 3, 3)])
+    sched._discovery_job(0, 30)
 
     client.find_slots.assert_not_called()
 
@@ -403,6 +835,18 @@ def test_discovery_job_skips_if_booked():
 # start() — job registration
 # ---------------------------------------------------------------------------
 
+def test_start_discovers_every_target():
+    client = MagicMock()
+    client.discover_venue_schedule.return_value = (30, None)
+    targets = [make_target(venue_id=1), make_target(venue_id=2)]
+    sched = make_scheduler(targets=targets, client=client)
+
+    sched.start()
+
+    discovered = sorted(c.args[0] for c in client.discover_venue_schedule.call_args_list)
+    assert discovered == [1, 2]
+
+
 def test_start_registers_poll_and_discovery_jobs_when_release_time_unknown():
     """When release_time is None, start() should register poll + discovery jobs."""
     client = MagicMock()
@@ -413,11 +857,47 @@ def test_start_registers_poll_and_discovery_jobs_when_release_time_unknown():
 
     sched.start()
 
-    job_ids = [kwargs["id"] for _, kwargs in sched._scheduler.add_job.call_args_list]
+    job_ids = [job["id"] for job in sched._scheduler.added]
     assert any("poll" in jid for jid in job_ids)
     assert any("discover" in jid for jid in job_ids)
 
 
+def test_schedule_discovery_registers_hourly_and_dense_probes():
+    target = make_target()
+    sched = make_scheduler(targets=[target])
+
+    sched._schedule_discovery(0, 30)
+
+    triggers = {
+        job["id"]: job["trigger"] for job in sched._scheduler.added
+    }
+    hourly = triggers[f"discover_{target.venue_id}"]
+    dense = triggers[f"discover_dense_{target.venue_id}"]
+    tz = ZoneInfo(target.venue_timezone)
+    start = datetime(2026, 3, 1, 8, 30, tzinfo=tz)
+    assert hourly.get_next_fire_time(None, start) == datetime(2026, 3, 1, 9, 0, tzinfo=tz)
+    assert dense.get_next_fire_time(None, start) == datetime(2026, 3, 1, 8, 59, tzinfo=tz)
+    after_hour = datetime(2026, 3, 1, 9, 0, 1, tzinfo=tz)
+    assert dense.get_next_fire_time(None, after_hour) == datetime(2026, 3, 1, 9, 0, 5, tzinfo=tz)
+    assert dense.get_next_fire_time(None, datetime(2026, 3, 1, 9, 1, 56, tzinfo=tz)) == (
+        datetime(2026, 3, 1, 9, 59, tzinfo=tz)
+    )
+
+
+def test_schedule_discovery_follows_venue_timezone():
+    """For a half-hour-offset venue the probes bracket the local hour, not the UTC one."""
+    target = make_target(venue_timezone="Asia/Kolkata")
+    sched = make_scheduler(targets=[target])
+
+    sched._schedule_discovery(0, 30)
+
+    hourly = next(job["trigger"] for job in sched._scheduler.added)
+    start = datetime(2026, 3, 1, 8, 0, tzinfo=timezone.utc)  # 13:30 IST
+    assert hourly.get_next_fire_time(None, start) == datetime(
+        2026, 3, 1, 14, 0, tzinfo=ZoneInfo("Asia/Kolkata")
+    )
+
+
 def test_start_registers_snipe_and_poll_jobs_when_release_time_known():
     """When release_time is known, start() schedules snipe + poll jobs."""
     client = MagicMock()
@@ -429,13 +909,32 @@ def test_start_registers_snipe_and_poll_jobs_when_release_time_known():
         end_date="2026-04-07",
         days_of_week=["Tuesday"],
     )
-    sched = make_scheduler(targets=[target], client=client)
-
-    with patch("bot.scheduler.date") as mock_date:
-        mock_date.today.return_value = date(2026, 3, 1)
-        mock_date.fromisoformat = date.fromisoformat
-        sched.start()
+    sched = make_scheduler(targets=[target], client=client, clock=lambda: date(2026, 3, 1))
+    sched.start()
 
-    job_ids = [kwargs["id"] for _, kwargs in sched._scheduler.add_job.call_args_list]
+    job_ids = [job["id"] for job in sched._scheduler.added]
     assert any("snipe" in jid for jid in job_ids)
     assert any("poll" in jid for jid in job_ids)
+
+
+def test_default_executor_sized_to_targets():
+    cfg = AppConfig(targets=[make_target(venue_id=i) for i in range(20)])
+    sched = Scheduler(client=MagicMock(), config=cfg, payment_method_id=42)
+
+    pool = sched._scheduler._executors["default"]._pool
+    assert pool._max_workers == 80
+
+
+def test_snipe_jobs_run_on_dedicated_executor():
+    """Snipe bursts must not occupy the default executor used by poll/discovery."""
+    client = MagicMock()
+    client.discover_venue_schedule.return_value = (30, "09:00")
+    target = make_target(start_date="2026-04-07", end_date="2026-04-07", days_of_week=["Tuesday"])
+    sched = make_scheduler(targets=[target], client=client, clock=lambda: date(2026, 3, 1))
+    sched.start()
+
+    for kwargs in sched._scheduler.added:
+        if kwargs["id"].startswith("snipe"):
+            assert kwargs["executor"] == SNIPE_EXECUTOR
+        else:
+            assert "executor" not in kwargs